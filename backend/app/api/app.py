@@ -2,30 +2,38 @@
 FastAPI application factory.
 Creates and configures the FastAPI app instance with all middleware and routes.
 """
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+import asyncio
+import logging
 import time
 
 try:
-    from slowapi import Limiter, _rate_limit_exceeded_handler
-    from slowapi.util import get_remote_address
+    from slowapi import _rate_limit_exceeded_handler
     from slowapi.errors import RateLimitExceeded
 except ModuleNotFoundError:  # pragma: no cover - optional dependency
-    Limiter = None  # type: ignore
     _rate_limit_exceeded_handler = None  # type: ignore
-    get_remote_address = None  # type: ignore
     RateLimitExceeded = None  # type: ignore
 
+from .limiter import limiter
+from ..utils.ratelimit import api_rate_limit
+from .responses import DefaultResponse
+from .endpoints import portfolio, trades, performance, signals, status
 
-class DummyLimiter:  # pragma: no cover - simple fallback
-    """Minimal limiter stub used when slowapi is unavailable."""
+logger = logging.getLogger(__name__)
 
-    def limit(self, *_args, **_kwargs):
-        def decorator(func):
-            return func
+# Encoded /health body, rebuilt at most once per second
+_health_cache = {"second": -1, "body": b""}
 
-        return decorator
+
+def _health_body() -> bytes:
+    """Return the encoded health payload, re-encoding only when the second changes."""
+    now = time.time()
+    second = int(now)
+    if second != _health_cache["second"]:
+        _health_cache["body"] = DefaultResponse(content={"status": "healthy", "timestamp": now}).body
+        _health_cache["second"] = second
+    return _health_cache["body"]
 
 
 def create_app() -> FastAPI:
@@ -39,16 +47,14 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title="Trading Bot API",
         description="API for accessing trading bot portfolio, trades, and performance data. Protected endpoints require API key authentication via Bearer token.",
-        version="1.0.0"
+        version="1.0.0",
+        default_response_class=DefaultResponse
     )
 
-    if Limiter and get_remote_address and RateLimitExceeded and _rate_limit_exceeded_handler:
-        limiter = Limiter(key_func=get_remote_address)
-        app.state.limiter = limiter
+    # Share the limiter used by endpoint decorators so limits are tracked in one place
+    app.state.limiter = limiter
+    if RateLimitExceeded and _rate_limit_exceeded_handler:
         app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-    else:
-        limiter = DummyLimiter()
-        app.state.limiter = limiter
 
     # Configure CORS
     app.add_middleware(
@@ -62,7 +68,8 @@ def create_app() -> FastAPI:
     # Global error handler
     @app.exception_handler(Exception)
     async def global_exception_handler(request, exc):
-        return JSONResponse(
+        logger.exception("Unhandled error on %s %s", request.method, request.url.path, exc_info=exc)
+        return DefaultResponse(
             status_code=500,
             content={"detail": "Internal server error", "timestamp": time.time()}
         )
@@ -72,22 +79,19 @@ def create_app() -> FastAPI:
     async def root():
         return {"message": "Trading Bot API", "version": "1.0.0", "status": "running"}
 
-    def _health_payload() -> dict:
-        return {"status": "healthy", "timestamp": time.time()}
-
-    # Health check endpoint with optional rate limiting
-    @app.get("/health")  # type: ignore[misc]
-    @limiter.limit("5/minute")  # type: ignore[call-arg]
-    async def health_check(request: Request):  # pragma: no cover - dynamic definition
-        return _health_payload()
-
-    # Import and include routers
-    from .endpoints import portfolio, trades, performance, signals, status
+    # Liveness probe: serve prebuilt bytes, throttled per client by the shared token bucket
+    @app.get("/health", dependencies=[Depends(api_rate_limit)])
+    async def health_check():  # pragma: no cover - dynamic definition
+        return Response(content=_health_body(), media_type="application/json")
 
-    @app.get("/status")
-    async def public_status():
-        return status.build_status_payload()
+    # Public status endpoint (no API key)
+    @app.get("/status", dependencies=[Depends(api_rate_limit)])
+    async def public_status(request: Request):
+        payload, cache_hit = await asyncio.to_thread(status.get_cached_status_payload)
+        cache_control = f"public, max-age={status.STATUS_CACHE_TTL}, stale-while-revalidate=30"
+        return status.status_response(request, payload, cache_hit, cache_control)
 
+    # Include routers
     app.include_router(portfolio.router, prefix="/api", tags=["portfolio"])
     app.include_router(trades.router, prefix="/api", tags=["trades"])
     app.include_router(performance.router, prefix="/api", tags=["performance"])
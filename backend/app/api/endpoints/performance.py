@@ -1,15 +1,12 @@
+import asyncio
 import logging
+import time
 from fastapi import APIRouter, HTTPException, Query, Request, Depends
 from typing import Dict, Any, List, Optional
-
-try:
-    from slowapi import Limiter
-    from slowapi.util import get_remote_address
-except ModuleNotFoundError:  # pragma: no cover - optional dependency
-    Limiter = None  # type: ignore
-    get_remote_address = None  # type: ignore
+import pandas as pd
 
 from ...db import supabase as supabase_db
+from ..limiter import rate_limit
 from datetime import datetime, timedelta, timezone
 from ...core.config import LEGAL_DISCLAIMER, load_config
 from ...services.fetcher import fetch_ohlcv
@@ -19,24 +16,14 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# In-memory cache of normalized equity windows, keyed by requested days
+equity_cache: Dict[int, Dict[str, Any]] = {}
+EQUITY_CACHE_TTL = 60  # 1 minute; equity rows land at most every few minutes
+EQUITY_COLUMNS = "timestamp,equity,cash"
 
-class DummyLimiter:  # pragma: no cover - simple fallback
-    def limit(self, *_args, **_kwargs):
-        def decorator(func):
-            return func
-
-        return decorator
-
-
-limiter = Limiter(key_func=get_remote_address) if Limiter and get_remote_address else DummyLimiter()
-rate_limit = limiter.limit
-
-
-def _parse_timestamp(value: str) -> datetime:
-    """Parse ISO timestamp strings with or without timezone suffix."""
-    if value.endswith('Z'):
-        value = value.replace('Z', '+00:00')
-    return datetime.fromisoformat(value)
+# Benchmark closes keyed by symbol, pre-indexed by calendar date for curve lookups
+benchmark_cache: Dict[str, Dict[str, Any]] = {}
+BENCHMARK_CACHE_TTL = 300  # 5 minutes, matches the OHLCV fetch cache
 
 
 def _normalize_equity_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -53,9 +40,137 @@ def _normalize_equity_records(records: List[Dict[str, Any]]) -> List[Dict[str, A
         })
     return normalized
 
+
+def _fetch_equity_window(days: int, now: datetime) -> List[Dict[str, Any]]:
+    """Return normalized equity rows for the last `days`, served from a short TTL cache."""
+    cached = equity_cache.get(days)
+    if cached and time.time() - cached['timestamp'] < EQUITY_CACHE_TTL:
+        return cached['data']
+
+    supabase = supabase_db.get_supabase_client()
+
+    # Calculate start date for requested window
+    start_date = now - timedelta(days=days)
+
+    # Primary query scoped to requested window
+    equity_query = (
+        supabase.table("equity")
+        .select(EQUITY_COLUMNS)
+        .gte("timestamp", start_date.isoformat())
+        .order("timestamp", desc=False)
+    )
+    equity_response = equity_query.execute()
+    equity_records = equity_response.data or []
+
+    # Fallback: pull the most recent N records even if older than requested window
+    if not equity_records:
+        logger.info("No equity rows within requested window; falling back to most recent records")
+        fallback_response = (
+            supabase.table("equity")
+            .select(EQUITY_COLUMNS)
+            .order("timestamp", desc=True)
+            .limit(days)
+            .execute()
+        )
+        fallback_records = fallback_response.data or []
+        fallback_records.reverse()  # Ensure chronological order
+        equity_records = fallback_records
+
+    equity_data = _normalize_equity_records(equity_records)
+    equity_cache[days] = {'data': equity_data, 'timestamp': time.time()}
+    return equity_data
+
+
+def _fetch_equity_endpoints(days: int, now: datetime) -> List[Dict[str, Any]]:
+    """Return only the first and last equity rows of the window, for metrics-only requests."""
+    supabase = supabase_db.get_supabase_client()
+    start_date = now - timedelta(days=days)
+
+    first_response = (
+        supabase.table("equity")
+        .select(EQUITY_COLUMNS)
+        .gte("timestamp", start_date.isoformat())
+        .order("timestamp", desc=False)
+        .limit(1)
+        .execute()
+    )
+    last_response = (
+        supabase.table("equity")
+        .select(EQUITY_COLUMNS)
+        .order("timestamp", desc=True)
+        .limit(1)
+        .execute()
+    )
+    first_rows = first_response.data or []
+    last_rows = last_response.data or []
+
+    # Nothing inside the window: reuse the full fetch so its fallback rules still apply
+    if not first_rows or not last_rows:
+        equity_data = _fetch_equity_window(days, now)
+        return equity_data[:1] + equity_data[1:][-1:]
+
+    if first_rows[0].get("timestamp") == last_rows[0].get("timestamp"):
+        return _normalize_equity_records(first_rows)
+    return _normalize_equity_records(first_rows + last_rows)
+
+
+def _benchmark_price_lookup(symbol: str) -> Optional[pd.Series]:
+    """Return benchmark closes indexed by calendar date, cached per symbol for BENCHMARK_CACHE_TTL."""
+    cached = benchmark_cache.get(symbol)
+    if cached and time.time() - cached['timestamp'] < BENCHMARK_CACHE_TTL:
+        return cached['data']
+
+    try:
+        market_df = fetch_ohlcv(symbol)
+        if market_df is None or market_df.empty or 'close' not in market_df.columns:
+            return None
+
+        prices = market_df['close'].sort_index().dropna().astype(float)
+        if prices.empty:
+            return None
+
+        # Price lookup by calendar date (last close wins on duplicate dates)
+        price_by_date = pd.Series(prices.to_numpy(), index=prices.index.date)
+        price_by_date = price_by_date[~price_by_date.index.duplicated(keep='last')]
+    except Exception as benchmark_error:
+        logger.warning("Benchmark data unavailable: %s", benchmark_error)
+        return None
+
+    benchmark_cache[symbol] = {'data': price_by_date, 'timestamp': time.time()}
+    return price_by_date
+
+
+def _build_benchmark_curve(
+    price_by_date: pd.Series,
+    equity_data: List[Dict[str, Any]],
+    equity_timestamps: pd.DatetimeIndex,
+    initial_equity: float
+) -> List[Dict[str, Any]]:
+    """Normalize benchmark closes onto the equity curve's dates in one vectorized pass."""
+    equity_frame = pd.DataFrame(equity_data, columns=["timestamp"])
+    equity_frame["date"] = equity_timestamps.date
+    equity_frame["price"] = equity_frame["date"].map(price_by_date)
+
+    # Use the first equity date as normalization anchor, else the earliest available price
+    benchmark_start_price = equity_frame["price"].iloc[0]
+    if pd.isna(benchmark_start_price):
+        benchmark_start_price = price_by_date.iloc[0]
+    if not benchmark_start_price:
+        return []
+
+    matched = equity_frame.dropna(subset=["price"])
+    matched = matched.assign(equity=matched["price"] / benchmark_start_price * initial_equity)
+    return matched[["timestamp", "equity", "price"]].to_dict(orient="records")
+
+
 @router.get("/performance")
 @rate_limit("30/minute")
-async def get_performance(request: Request, days: int = Query(30, ge=1, le=365, description="Number of days of performance data to return"), authenticated: bool = Depends(verify_api_key)):
+async def get_performance(
+    request: Request,
+    days: int = Query(30, ge=1, le=365, description="Number of days of performance data to return"),
+    include_curve: bool = Query(True, description="Set to false to return metrics only, skipping the equity and benchmark curves"),
+    authenticated: bool = Depends(verify_api_key)
+):
     """
     Get equity curve data for performance analysis.
     """
@@ -63,43 +178,29 @@ async def get_performance(request: Request, days: int = Query(30, ge=1, le=365,
         config = load_config()
         starting_equity = float(config.get("STARTING_EQUITY", 100000))
 
-        supabase = supabase_db.get_supabase_client()
-
-        # Calculate start date for requested window
-        start_date = datetime.now(timezone.utc) - timedelta(days=days)
+        benchmark_symbol = "SPY"
+        now = datetime.now(timezone.utc)
 
-        # Primary query scoped to requested window
-        equity_query = (
-            supabase.table("equity")
-            .select("*")
-            .gte("timestamp", start_date.isoformat())
-            .order("timestamp", desc=False)
-        )
-        equity_response = equity_query.execute()
-        equity_records = equity_response.data or []
-
-        # Fallback: pull the most recent N records even if older than requested window
-        if not equity_records:
-            logger.info("No equity rows within requested window; falling back to most recent records")
-            fallback_response = (
-                supabase.table("equity")
-                .select("*")
-                .order("timestamp", desc=True)
-                .limit(days)
-                .execute()
+        if include_curve:
+            # Equity window and benchmark prices are independent IO; fetch them concurrently
+            equity_data, price_by_date = await asyncio.gather(
+                asyncio.to_thread(_fetch_equity_window, days, now),
+                asyncio.to_thread(_benchmark_price_lookup, benchmark_symbol)
             )
-            fallback_records = fallback_response.data or []
-            fallback_records.reverse()  # Ensure chronological order
-            equity_records = fallback_records
+        else:
+            # Metrics only need the window's endpoints; the benchmark curve is skipped entirely
+            equity_data = await asyncio.to_thread(_fetch_equity_endpoints, days, now)
+            price_by_date = None
 
-        equity_data = _normalize_equity_records(equity_records)
+        # Parse all equity timestamps in one vectorized pass
+        equity_timestamps = pd.to_datetime([row["timestamp"] for row in equity_data], utc=True, format="ISO8601")
 
         if equity_data:
             initial_equity = equity_data[0]["equity"]
             final_equity = equity_data[-1]["equity"]
             total_return = ((final_equity - initial_equity) / initial_equity * 100) if initial_equity > 0 else 0
-            latest_timestamp = _parse_timestamp(equity_data[-1]["timestamp"])
-            data_delay_minutes = max(0, int((datetime.now(timezone.utc) - latest_timestamp).total_seconds() // 60))
+            latest_timestamp = equity_timestamps[-1]
+            data_delay_minutes = max(0, int((now - latest_timestamp).total_seconds() // 60))
         else:
             initial_equity = starting_equity
             final_equity = starting_equity
@@ -108,57 +209,27 @@ async def get_performance(request: Request, days: int = Query(30, ge=1, le=365,
 
         benchmark_curve: List[Dict[str, Any]] = []
         benchmark_metrics: Optional[Dict[str, Any]] = None
-        benchmark_symbol = "SPY"
 
         try:
-            market_df = fetch_ohlcv(benchmark_symbol)
-            if market_df is not None and not market_df.empty and equity_data:
-                market_df = market_df.sort_index()
-                price_series = market_df['close'] if 'close' in market_df.columns else None
-
-                if price_series is not None and not price_series.empty:
-                    # Build price lookup by date for easy joins
-                    price_lookup = {idx.date(): float(price) for idx, price in price_series.items() if price is not None}
-
-                    # Use the first equity date as normalization anchor
-                    equity_start_dt = _parse_timestamp(equity_data[0]['timestamp'])
-                    benchmark_start_price = price_lookup.get(equity_start_dt.date())
-
-                    if benchmark_start_price is None:
-                        # Fallback: use earliest available price
-                        first_entry = next(iter(price_lookup.values()), None)
-                        benchmark_start_price = float(first_entry) if first_entry is not None else None
-
-                    if benchmark_start_price:
-                        benchmark_points: List[Dict[str, Any]] = []
-                        for point in equity_data:
-                            point_dt = _parse_timestamp(point['timestamp']).date()
-                            benchmark_price = price_lookup.get(point_dt)
-                            if benchmark_price is None:
-                                continue
-                            normalized_equity = (benchmark_price / benchmark_start_price) * initial_equity
-                            benchmark_points.append({
-                                "timestamp": point['timestamp'],
-                                "equity": normalized_equity,
-                                "price": benchmark_price
-                            })
-
-                        if benchmark_points:
-                            benchmark_curve = benchmark_points
-                            benchmark_initial = benchmark_points[0]['equity']
-                            benchmark_final = benchmark_points[-1]['equity']
-                            benchmark_return = ((benchmark_final - benchmark_initial) / benchmark_initial * 100) if benchmark_initial > 0 else 0
-                            benchmark_metrics = {
-                                "initial_equity": benchmark_initial,
-                                "final_equity": benchmark_final,
-                                "total_return_percent": benchmark_return,
-                                "period_days": len(benchmark_points)
-                            }
+            if price_by_date is not None and equity_data:
+                benchmark_points = _build_benchmark_curve(price_by_date, equity_data, equity_timestamps, initial_equity)
+
+                if benchmark_points:
+                    benchmark_curve = benchmark_points
+                    benchmark_initial = benchmark_points[0]['equity']
+                    benchmark_final = benchmark_points[-1]['equity']
+                    benchmark_return = ((benchmark_final - benchmark_initial) / benchmark_initial * 100) if benchmark_initial > 0 else 0
+                    benchmark_metrics = {
+                        "initial_equity": benchmark_initial,
+                        "final_equity": benchmark_final,
+                        "total_return_percent": benchmark_return,
+                        "period_days": len(benchmark_points)
+                    }
         except Exception as benchmark_error:
             logger.warning("Benchmark data unavailable: %s", benchmark_error)
 
         return {
-            "equity_curve": equity_data,
+            "equity_curve": equity_data if include_curve else [],
             "metrics": {
                 "initial_equity": initial_equity,
                 "final_equity": final_equity,
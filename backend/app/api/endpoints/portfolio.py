@@ -1,30 +1,87 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, Depends, Request
-from typing import Dict, Any
-
-try:
-    from slowapi import Limiter
-    from slowapi.util import get_remote_address
-except ModuleNotFoundError:  # pragma: no cover - optional dependency
-    Limiter = None  # type: ignore
-    get_remote_address = None  # type: ignore
+from typing import Dict, Any, List
+import logging
+import numpy as np
 
 from ...db import supabase as supabase_db
+from ..limiter import rate_limit
 from ...core.config import load_config, LEGAL_DISCLAIMER
 from ...utils.auth import verify_api_key
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+POSITION_COLUMNS = "symbol,quantity,current_price,average_entry_price,unrealized_pnl,timestamp"
 
-class DummyLimiter:  # pragma: no cover - simple fallback
-    def limit(self, *_args, **_kwargs):
-        def decorator(func):
-            return func
 
-        return decorator
+def _summarize_positions(raw_positions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Transform raw position rows and total their unrealized P/L client-side."""
+    # Pull numeric columns into arrays so P/L math runs vectorized
+    columns = np.array(
+        [
+            [
+                float(pos.get("quantity", 0)),
+                float(pos.get("current_price", 0)),
+                float(pos.get("average_entry_price", 0)),
+                float(pos.get("unrealized_pnl", 0))
+            ]
+            for pos in raw_positions
+        ],
+        dtype=np.float64
+    ).reshape(-1, 4)
+    quantities, current_prices, avg_prices, unrealized_pnls = columns.T
+    market_values = quantities * current_prices
 
+    # Transform positions to match frontend expectations
+    positions = [
+        {
+            "symbol": pos.get("symbol", ""),
+            "quantity": quantity,
+            "avg_price": avg_price,
+            "current_price": current_price,
+            "market_value": market_value,
+            "unrealized_pl": unrealized_pnl,
+            "timestamp": pos.get("timestamp")
+        }
+        for pos, quantity, avg_price, current_price, market_value, unrealized_pnl in zip(
+            raw_positions,
+            quantities.tolist(),
+            avg_prices.tolist(),
+            current_prices.tolist(),
+            market_values.tolist(),
+            unrealized_pnls.tolist()
+        )
+    ]
 
-limiter = Limiter(key_func=get_remote_address) if Limiter and get_remote_address else DummyLimiter()
-rate_limit = limiter.limit
+    return {"positions": positions, "total_pl": float(unrealized_pnls.sum())}
+
+
+def _fetch_portfolio_summary(supabase) -> Dict[str, Any]:
+    """
+    Fetch enriched positions and total P/L via the get_portfolio_summary RPC.
+    Falls back to aggregating the positions table when the RPC is not deployed.
+    """
+    try:
+        summary = supabase.rpc("get_portfolio_summary", {}).execute().data
+        if isinstance(summary, dict) and "positions" in summary:
+            return {
+                "positions": summary["positions"] or [],
+                "total_pl": float(summary.get("total_pl") or 0)
+            }
+    except Exception as e:
+        logger.warning("get_portfolio_summary RPC unavailable, aggregating client-side: %s", e)
+
+    positions_response = supabase.table("positions").select(POSITION_COLUMNS).execute()
+    raw_positions = positions_response.data if positions_response.data else []
+    return _summarize_positions(raw_positions)
+
+
+def _fetch_current_equity(supabase) -> Dict[str, Any]:
+    """Fetch the most recent equity row."""
+    equity_response = supabase.table("equity").select("timestamp,equity").order("timestamp", desc=True).limit(1).execute()
+    return equity_response.data[0] if equity_response.data else {"equity": 0, "timestamp": None}
 
 
 @router.get("/portfolio")
@@ -36,40 +93,16 @@ async def get_portfolio(request: Request, authenticated: bool = Depends(verify_a
     try:
         supabase = supabase_db.get_supabase_client()
         
-        # Fetch current positions
-        positions_response = supabase.table("positions").select("*").execute()
-        raw_positions = positions_response.data if positions_response.data else []
-        
-        # Transform positions to match frontend expectations
-        positions = []
-        for pos in raw_positions:
-            quantity = float(pos.get("quantity", 0))
-            current_price = float(pos.get("current_price", 0))
-            avg_price = float(pos.get("average_entry_price", 0))
-            unrealized_pnl = float(pos.get("unrealized_pnl", 0))
-            
-            transformed_position = {
-                "symbol": pos.get("symbol", ""),
-                "quantity": quantity,
-                "avg_price": avg_price,
-                "current_price": current_price,
-                "market_value": quantity * current_price,
-                "unrealized_pl": unrealized_pnl,
-                "timestamp": pos.get("timestamp")
-            }
-            positions.append(transformed_position)
-        
-        # Fetch current equity
-        equity_response = supabase.table("equity").select("*").order("timestamp.desc").limit(1).execute()
-        current_equity = equity_response.data[0] if equity_response.data else {"equity": 0, "timestamp": None}
-        
-        # Calculate total P/L using transformed data
-        total_pl = sum(pos["unrealized_pl"] for pos in positions)
+        # Positions summary and current equity are independent; fetch them concurrently
+        summary, current_equity = await asyncio.gather(
+            asyncio.to_thread(_fetch_portfolio_summary, supabase),
+            asyncio.to_thread(_fetch_current_equity, supabase)
+        )
         
         return {
-            "positions": positions,
+            "positions": summary["positions"],
             "current_equity": current_equity.get("equity", 0),
-            "total_pl": total_pl,
+            "total_pl": summary["total_pl"],
             "timestamp": current_equity.get("timestamp"),
             "data_delay_minutes": 15,  # As per PRD requirement
             "disclaimer": LEGAL_DISCLAIMER
@@ -1,33 +1,73 @@
+import asyncio
+from dataclasses import dataclass
 from fastapi import APIRouter, HTTPException, Request, Depends
-from typing import Dict, Any
-import pandas as pd
-
-try:
-    from slowapi import Limiter
-    from slowapi.util import get_remote_address
-except ModuleNotFoundError:  # pragma: no cover - optional dependency
-    Limiter = None  # type: ignore
-    get_remote_address = None  # type: ignore
+from typing import Dict, Any, Optional
+import logging
 
 from ...db import supabase as supabase_db
+from ..limiter import rate_limit
 from bot.strategy.signals import generate_signals
 from ...services.fetcher import fetch_ohlcv
 from ...core.config import LEGAL_DISCLAIMER
 from ...utils.auth import verify_api_key
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Transform signal from integer to string
+SIGNAL_LABELS = {-1: "SELL", 0: "HOLD", 1: "BUY"}
+
+
+@dataclass(slots=True)
+class SignalRecord:
+    """Latest signal and indicator values for one symbol."""
+    signal: str
+    sma_20: Optional[float]
+    sma_50: Optional[float]
+    rsi: Optional[float]
+    current_price: float
+    conditions: Dict[str, bool]
+    strength: float
+
+
+def _as_float(value: Any) -> Optional[float]:
+    """Convert a scalar to float, mapping None and NaN to None."""
+    if value is None:
+        return None
+    value = float(value)
+    return value if value == value else None
+
 
-class DummyLimiter:  # pragma: no cover - simple fallback
-    def limit(self, *_args, **_kwargs):
-        def decorator(func):
-            return func
+def _build_signal_record(signals: Dict[str, Any]) -> SignalRecord:
+    """Build the per-symbol response from the latest indicator row, converting values once."""
+    row = signals['data'].iloc[-1].to_dict()
+    signal = signals['signal']
+    sma20 = _as_float(row.get('SMA20'))
+    sma50 = _as_float(row.get('SMA50'))
+    rsi = _as_float(row.get('RSI'))
 
-        return decorator
+    # Create conditions object
+    conditions = {}
+    if sma20 is not None and sma50 is not None:
+        conditions['sma_crossover'] = sma20 > sma50 if signal == 1 else sma20 < sma50
 
+    if rsi is not None:
+        if signal == 1:  # BUY
+            conditions['rsi_filter'] = rsi < 70
+        elif signal == -1:  # SELL
+            conditions['rsi_filter'] = rsi > 30
+
+    return SignalRecord(
+        signal=SIGNAL_LABELS.get(signal, "HOLD"),
+        sma_20=sma20,
+        sma_50=sma50,
+        rsi=rsi,
+        current_price=float(row['close']),
+        conditions=conditions,
+        strength=float(signals.get('strength', 0.5))
+    )
 
-limiter = Limiter(key_func=get_remote_address) if Limiter and get_remote_address else DummyLimiter()
-rate_limit = limiter.limit
 
 @router.get("/signals")
 @rate_limit("30/minute")
@@ -45,52 +85,24 @@ async def get_signals(request: Request, authenticated: bool = Depends(verify_api
         if not symbols:
             symbols = ["AAPL"]  # Default symbol as per main.py
         
-        signals_data = {}
+        signals_data: Dict[str, Any] = {}
         latest_timestamp = None
         
-        for symbol in symbols:
-            # Fetch latest OHLCV data
-            ohlcv_data = fetch_ohlcv(symbol)
+        # Fetch OHLCV for all symbols concurrently; the fetcher is blocking IO
+        ohlcv_results = await asyncio.gather(
+            *(asyncio.to_thread(fetch_ohlcv, symbol) for symbol in symbols),
+            return_exceptions=True
+        )
+        
+        for symbol, ohlcv_data in zip(symbols, ohlcv_results):
+            if isinstance(ohlcv_data, Exception):
+                logger.warning("OHLCV fetch failed for %s: %s", symbol, ohlcv_data)
+                ohlcv_data = None
             if ohlcv_data is not None and not ohlcv_data.empty:
                 # Generate signals
                 signals = generate_signals(ohlcv_data)
                 if signals:
-                    # Extract latest technical indicators from the data
-                    latest_data = signals['data'].iloc[-1]
-                    
-                    # Transform signal from integer to string
-                    signal_map = {-1: "SELL", 0: "HOLD", 1: "BUY"}
-                    signal_str = signal_map.get(signals['signal'], "HOLD")
-                    
-                    # Get current price
-                    current_price = float(latest_data['close'])
-                    
-                    # Create conditions object
-                    conditions = {}
-                    if 'SMA20' in latest_data.index and 'SMA50' in latest_data.index:
-                        sma20 = latest_data['SMA20']
-                        sma50 = latest_data['SMA50']
-                        if not (pd.isna(sma20) or pd.isna(sma50)):
-                            conditions['sma_crossover'] = bool(sma20 > sma50) if signals['signal'] == 1 else bool(sma20 < sma50)
-                    
-                    if 'RSI' in latest_data.index:
-                        rsi = latest_data['RSI']
-                        if not pd.isna(rsi):
-                            if signals['signal'] == 1:  # BUY
-                                conditions['rsi_filter'] = bool(rsi < 70)
-                            elif signals['signal'] == -1:  # SELL
-                                conditions['rsi_filter'] = bool(rsi > 30)
-                    
-                    # Build response data
-                    signals_data[symbol] = {
-                        "signal": signal_str,
-                        "sma_20": float(latest_data.get('SMA20', 0)) if not pd.isna(latest_data.get('SMA20')) else None,
-                        "sma_50": float(latest_data.get('SMA50', 0)) if not pd.isna(latest_data.get('SMA50')) else None,
-                        "rsi": float(latest_data.get('RSI', 0)) if not pd.isna(latest_data.get('RSI')) else None,
-                        "current_price": current_price,
-                        "conditions": conditions,
-                        "strength": float(signals.get('strength', 0.5))
-                    }
+                    signals_data[symbol] = _build_signal_record(signals)
                     
                     # Update latest timestamp
                     if latest_timestamp is None:
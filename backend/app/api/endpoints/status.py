@@ -1,34 +1,62 @@
-from fastapi import APIRouter, HTTPException, Request, Depends
-from typing import Dict, Any
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from fastapi import APIRouter, HTTPException, Request, Response, Depends
+from typing import Dict, Any, Optional, Tuple
 from ...db import supabase as supabase_db
+from ..http_cache import conditional_response, weak_etag
 from datetime import datetime, timezone
 from ...core.config import LEGAL_DISCLAIMER, ConfigError
 from ...utils.auth import verify_api_key
+from ...utils.ratelimit import api_rate_limit
 
 router = APIRouter()
 
-try:
-    from slowapi import Limiter
-    from slowapi.util import get_remote_address
-except ModuleNotFoundError:  # pragma: no cover - optional dependency
-    Limiter = None  # type: ignore
-    get_remote_address = None  # type: ignore
+# Short-lived payload cache so monitor polling doesn't hit Supabase on every request
+STATUS_CACHE_TTL = int(os.getenv("STATUS_CACHE_TTL", "10"))
+status_cache: Dict[str, Any] = {"value": None, "expires": 0.0}
+_status_lock = threading.Lock()
 
+# Supabase client is synchronous; a small pool lets the status queries overlap
+_query_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="status-query")
 
-class DummyLimiter:  # pragma: no cover - simple fallback
-    def limit(self, *_args, **_kwargs):
-        def decorator(func):
-            return func
+# Fields shared by every status payload, built once at import
+STATUS_STATIC_FIELDS: Dict[str, Any] = {"version": "1.0.0", "disclaimer": LEGAL_DISCLAIMER}
 
-        return decorator
 
+@lru_cache(maxsize=32)
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an ISO timestamp; the latest equity row repeats across polls, so memoize."""
+    return datetime.fromisoformat(value)
 
-limiter = Limiter(key_func=get_remote_address) if Limiter and get_remote_address else DummyLimiter()
-rate_limit = limiter.limit
+
+def _probe_database(supabase: Any) -> str:
+    """Report whether a trivial equity query succeeds."""
+    try:
+        supabase.table("equity").select("id").limit(1).execute()
+        return "healthy"
+    except Exception:
+        return "unhealthy"
+
+
+def _fetch_latest_timestamp(supabase: Any) -> Optional[str]:
+    """Return the timestamp of the newest equity row, if any."""
+    latest_data = (
+        supabase.table("equity")
+        .select("timestamp")
+        .order("timestamp", desc=True)
+        .limit(1)
+        .execute()
+    )
+    return latest_data.data[0]["timestamp"] if latest_data.data else None
 
 
 def build_status_payload() -> Dict[str, Any]:
-    """Collect service health information for status endpoints."""
+    """Collect service health information for status endpoints; system_time is added per response."""
+    now = datetime.now(timezone.utc)
     try:
         supabase = supabase_db.get_supabase_client()
     except ConfigError as exc:
@@ -39,30 +67,18 @@ def build_status_payload() -> Dict[str, Any]:
             },
             "data_delay_minutes": None,
             "last_update": None,
-            "system_time": datetime.now(timezone.utc).isoformat(),
-            "version": "1.0.0",
-            "disclaimer": LEGAL_DISCLAIMER,
+            **STATUS_STATIC_FIELDS,
             "message": str(exc)
         }
 
-    db_status = "healthy"
-    try:
-        supabase.table("equity").select("id").limit(1).execute()
-    except Exception:
-        db_status = "unhealthy"
-
-    latest_data = (
-        supabase.table("equity")
-        .select("timestamp")
-        .order("timestamp.desc")
-        .limit(1)
-        .execute()
-    )
-
-    latest_timestamp = latest_data.data[0]["timestamp"] if latest_data.data else None
+    # Independent queries: run them side by side so latency is one round-trip, not two
+    probe = _query_pool.submit(_probe_database, supabase)
+    latest = _query_pool.submit(_fetch_latest_timestamp, supabase)
+    db_status = probe.result()
+    latest_timestamp = latest.result()
 
     if latest_timestamp:
-        delay = datetime.now(timezone.utc) - datetime.fromisoformat(latest_timestamp)
+        delay = now - _parse_timestamp(latest_timestamp)
         delay_minutes = int(delay.total_seconds() / 60)
     else:
         delay_minutes = None
@@ -74,18 +90,46 @@ def build_status_payload() -> Dict[str, Any]:
         },
         "data_delay_minutes": delay_minutes,
         "last_update": latest_timestamp,
-        "system_time": datetime.now(timezone.utc).isoformat(),
-        "version": "1.0.0",
-        "disclaimer": LEGAL_DISCLAIMER
+        **STATUS_STATIC_FIELDS
     }
 
-@router.get("/status")
-@rate_limit("30/minute")
+def get_cached_status_payload() -> Tuple[Dict[str, Any], bool]:
+    """Return the status payload and whether it was served from the cache."""
+    if status_cache["value"] is not None and time.monotonic() < status_cache["expires"]:
+        return status_cache["value"], True
+
+    # Single-flight: concurrent misses wait for one refresh instead of all querying Supabase
+    with _status_lock:
+        if status_cache["value"] is not None and time.monotonic() < status_cache["expires"]:
+            return status_cache["value"], True
+        payload = build_status_payload()
+        status_cache["value"] = payload
+        status_cache["expires"] = time.monotonic() + STATUS_CACHE_TTL
+        return payload, False
+
+
+def status_response(
+    request: Request,
+    payload: Dict[str, Any],
+    cache_hit: bool,
+    cache_control: str
+) -> Response:
+    """Render a status payload with cache headers, answering 304 when the client's copy is current."""
+    # The delay grows while last_update stays put, so it is part of the validator too
+    etag = weak_etag(payload["last_update"], payload["data_delay_minutes"], payload["status"]["database"])
+    # system_time is the server clock at response time, so it is stamped here rather than cached
+    content = {**payload, "system_time": datetime.now(timezone.utc)}
+    return conditional_response(request, content, etag, cache_control, {"X-Cache": "HIT" if cache_hit else "MISS"})
+
+
+@router.get("/status", dependencies=[Depends(api_rate_limit)])
 async def get_status(request: Request, authenticated: bool = Depends(verify_api_key)):
     """
     Get system status and data delay information.
     """
     try:
-        return build_status_payload()
+        payload, cache_hit = await asyncio.to_thread(get_cached_status_payload)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
+        raise HTTPException(status_code=500, detail=str(e))
+    # Authenticated response: browsers may reuse it, shared caches must not
+    return status_response(request, payload, cache_hit, f"private, max-age={STATUS_CACHE_TTL}")
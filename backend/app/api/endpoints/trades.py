@@ -1,96 +1,90 @@
 from fastapi import APIRouter, HTTPException, Query, Request, Depends
+from datetime import datetime
 from typing import Dict, Any, List, Optional
 import logging
 
-try:
-    from slowapi import Limiter
-    from slowapi.util import get_remote_address
-except ModuleNotFoundError:  # pragma: no cover - optional dependency
-    Limiter = None  # type: ignore
-    get_remote_address = None  # type: ignore
-
 from ...db import supabase as supabase_db
+from ...db.operations import TRADES_NEWEST_FIRST, trades_before
+from ..http_cache import conditional_response, weak_etag
 from ...core.config import LEGAL_DISCLAIMER
 from ...utils.auth import verify_api_key
+from ...utils.ratelimit import api_rate_limit
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-
-class DummyLimiter:  # pragma: no cover - simple fallback
-    def limit(self, *_args, **_kwargs):
-        def decorator(func):
-            return func
-
-        return decorator
-
-
-limiter = Limiter(key_func=get_remote_address) if Limiter and get_remote_address else DummyLimiter()
-rate_limit = limiter.limit
-
-@router.get("/trades")
-@rate_limit("30/minute")
+@router.get("/trades", dependencies=[Depends(api_rate_limit)])
 async def get_trades(
     request: Request,
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (deprecated: prefer the `before` cursor)"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
     symbol: Optional[str] = Query(None, description="Filter by symbol"),
+    before: Optional[datetime] = Query(None, description="Cursor: only return trades older than this ISO timestamp (use `next_cursor.before` from the previous page, URL-encoded)"),
+    before_id: Optional[int] = Query(None, ge=1, description="Cursor tiebreak: with `before`, also return trades at that timestamp with a lower id (use `next_cursor.before_id`)"),
+    include_count: bool = Query(False, description="Include total_count/total_pages (costs an exact COUNT on the server)"),
     authenticated: bool = Depends(verify_api_key)
 ):
     """
     Get trade history with pagination and optional symbol filter.
+    Pass `before` and `before_id` for keyset pagination; `page` is kept for backward compatibility.
     """
     try:
         supabase = supabase_db.get_supabase_client()
         
-        # Calculate offset
-        offset = (page - 1) * page_size
+        # Offset only applies to legacy page-based requests
+        offset = 0 if before else (page - 1) * page_size
         
-        # Get total count using a separate query
-        # Note: Supabase Python client v1.0.3 has issues with count parameter
-        # Using a workaround by fetching all IDs and counting them
-        count_query = supabase.table("trades").select("id")
+        # Exact totals are opt-in; when requested PostgREST returns them in Content-Range alongside the page
+        if include_count:
+            data_query = supabase.table("trades").select("*", count="exact")
+        else:
+            data_query = supabase.table("trades").select("*")
         
-        # Apply symbol filter if provided for count
+        # Apply symbol filter if provided
         if symbol:
-            count_query = count_query.eq("symbol", symbol)
+            data_query = data_query.eq("symbol", symbol)
         
-        # Get total count by fetching all records and counting
-        try:
-            count_response = count_query.execute()
-            total_count = len(count_response.data) if count_response.data else 0
-        except Exception as e:
-            logger.error(f"Error getting count: {e}")
-            total_count = 0
+        data_query = data_query.order(TRADES_NEWEST_FIRST, desc=True)
         
-        # Build query for data retrieval
-        data_query = supabase.table("trades").select("*")
+        # Keyset pagination is an index range scan at any depth; OFFSET scans and discards rows
+        if before:
+            trades_response = trades_before(data_query, before, before_id).limit(page_size).execute()
+        else:
+            trades_response = data_query.range(offset, offset + page_size - 1).execute()
         
-        # Apply symbol filter if provided for data
-        if symbol:
-            data_query = data_query.eq("symbol", symbol)
+        trades = trades_response.data if trades_response.data else []
         
-        # Get paginated results
-        trades_response = (
-            data_query
-            .order("timestamp.desc")
-            .range(offset, offset + page_size - 1)
-            .execute()
-        )
+        total_count: Optional[int] = None
+        total_pages: Optional[int] = None
+        if include_count:
+            # Older clients may not expose the count; fall back to what this page proves exists
+            total_count = getattr(trades_response, "count", None)
+            if not isinstance(total_count, int):
+                logger.warning("Trade count unavailable from response; using page-based lower bound")
+                total_count = offset + len(trades)
+            total_pages = (total_count + page_size - 1) // page_size
         
-        trades = trades_response.data if trades_response.data else []
+        # (timestamp, id) of the last row, so trades sharing its timestamp aren't skipped
+        next_cursor = None
+        if len(trades) == page_size:
+            next_cursor = {"before": trades[-1].get("timestamp"), "before_id": trades[-1].get("id")}
+        
+        # The newest trade on the page and the total identify this page's contents
+        etag = weak_etag(trades[0].get("timestamp") if trades else None, total_count, next_cursor, len(trades))
         
-        return {
+        payload = {
             "trades": trades,
             "pagination": {
                 "page": page,
                 "page_size": page_size,
                 "total_count": total_count,
-                "total_pages": (total_count + page_size - 1) // page_size
+                "total_pages": total_pages,
+                "next_cursor": next_cursor
             },
             "data_delay_minutes": 15,  # As per PRD requirement
             "disclaimer": LEGAL_DISCLAIMER
         }
+        return conditional_response(request, payload, etag, "private, max-age=10, stale-while-revalidate=30")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
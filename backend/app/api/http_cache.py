@@ -0,0 +1,31 @@
+"""
+Conditional GET helpers.
+Endpoints attach a weak ETag and Cache-Control, and answer 304 when the client's copy is current.
+"""
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+from .responses import DefaultResponse
+
+
+def weak_etag(*parts: Any) -> str:
+    """Build a weak ETag that is stable across processes for the given values."""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def conditional_response(
+    request: Request,
+    content: Any,
+    etag: str,
+    cache_control: str,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Render `content` with validators attached, or an empty 304 if `If-None-Match` matches."""
+    response_headers = {"ETag": etag, "Cache-Control": cache_control, **(headers or {})}
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=304, headers=response_headers)
+    # Returning the response directly skips FastAPI's jsonable_encoder pass over the payload
+    return DefaultResponse(content=content, headers=response_headers)
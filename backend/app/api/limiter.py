@@ -0,0 +1,43 @@
+"""
+Shared slowapi rate limiter for the API.
+A single instance is registered on app.state and used by every @rate_limit decorator.
+
+The API runs two limiters on purpose:
+- This one (30/minute) guards /api/portfolio, /api/performance and /api/signals. Its counters live
+  in RATE_LIMIT_STORAGE_URI, so pointing that at Redis shares them across workers and replicas.
+  Over-limit requests get slowapi's 429 body ({"error": "Rate limit exceeded: ..."}).
+- utils.ratelimit.api_rate_limit, an in-process token bucket, guards the polled /api/status,
+  /api/trades and the public /status and /health. It is per process, ignores
+  RATE_LIMIT_STORAGE_URI, and answers 429 with {"detail": "Rate limit exceeded"} plus Retry-After.
+Each limiter keeps its own per-client state, so a client's budget on one group doesn't count
+against the other.
+"""
+import os
+
+try:
+    from slowapi import Limiter
+    from slowapi.util import get_remote_address
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    Limiter = None  # type: ignore
+    get_remote_address = None  # type: ignore
+
+
+class DummyLimiter:  # pragma: no cover - simple fallback
+    """Minimal limiter stub used when slowapi is unavailable."""
+
+    def limit(self, *_args, **_kwargs):
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+# Point RATE_LIMIT_STORAGE_URI at redis://... to share limits across workers
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+
+if Limiter and get_remote_address:
+    limiter = Limiter(key_func=get_remote_address, storage_uri=RATE_LIMIT_STORAGE_URI)
+else:
+    limiter = DummyLimiter()
+
+rate_limit = limiter.limit
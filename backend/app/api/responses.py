@@ -0,0 +1,18 @@
+"""
+Default response class for the API.
+ORJSONResponse when orjson is installed; otherwise a JSONResponse that encodes values the way FastAPI does.
+"""
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson  # noqa: F401 - required by ORJSONResponse
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    class DefaultResponse(JSONResponse):  # type: ignore[no-redef]
+        """JSONResponse that also accepts datetimes and other non-JSON-native values."""
+
+        def render(self, content: Any) -> bytes:
+            return super().render(jsonable_encoder(content))
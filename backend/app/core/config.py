@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 class ConfigError(Exception):
     pass
@@ -18,8 +19,13 @@ LEGAL_DISCLAIMER = (
     "Trading involves risk and you may lose money. Please consult a qualified financial advisor before making investment decisions."
 )
 
+@lru_cache(maxsize=1)
 def load_config():
-    # Check TEST_MODE at function call time, not import time
+    """
+    Load configuration from environment variables.
+    Cached after the first successful call; use load_config.cache_clear() to reload.
+    """
+    # Check TEST_MODE at first call time, not import time
     test_mode = os.getenv("TEST_MODE", "false").lower() == "true"
     
     if not test_mode:
@@ -4,9 +4,20 @@ Consolidates logging setup that was duplicated across multiple files.
 """
 import os
 import logging
+import logging.handlers
 from pathlib import Path
 from typing import Optional, List
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# File records are buffered and written in batches; errors flush immediately
+FILE_LOG_BUFFER_CAPACITY = 1024
+FILE_LOG_MAX_BYTES = 64 * 2**20
+FILE_LOG_BACKUP_COUNT = 5
+
+# Set once the root logger has handlers; later calls are no-ops instead of reopening log files
+_CONFIGURED = False
+
 
 def setup_logging(
     service_name: str = "app",
@@ -26,6 +37,10 @@ def setup_logging(
     Returns:
         Configured logger instance
     """
+    global _CONFIGURED
+    if _CONFIGURED:
+        return logging.getLogger(__name__)
+    
     # Determine log directory
     if log_dir is None:
         # Default to logs directory relative to project root
@@ -44,21 +59,33 @@ def setup_logging(
     if include_file_handler:
         try:
             log_file = log_dir / f'{service_name}.log'
-            file_handler = logging.FileHandler(log_file)
-            handlers.append(file_handler)
+            # delay=True defers opening the file until the first buffered flush
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file,
+                maxBytes=FILE_LOG_MAX_BYTES,
+                backupCount=FILE_LOG_BACKUP_COUNT,
+                delay=True
+            )
+            file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            handlers.append(logging.handlers.MemoryHandler(
+                capacity=FILE_LOG_BUFFER_CAPACITY,
+                flushLevel=logging.ERROR,
+                target=file_handler,
+                flushOnClose=True  # logging's atexit shutdown drains the buffer
+            ))
         except (OSError, PermissionError) as e:
             print(f"Warning: Could not create {service_name} log file: {e}")
     
     # Configure logging
     logging.basicConfig(
         level=getattr(logging, log_level.upper()),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=handlers,
-        force=True  # Override any existing configuration
+        format=LOG_FORMAT,
+        handlers=handlers
     )
+    _CONFIGURED = True
     
     logger = logging.getLogger(__name__)
-    logger.info(f"Logging initialized for {service_name} service")
+    logger.info("Logging initialized for %s service", service_name)
     
     return logger
 
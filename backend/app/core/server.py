@@ -4,63 +4,13 @@ Consolidates server startup logic that was duplicated across multiple files.
 """
 import os
 import uvicorn
-import threading
-from http.server import HTTPServer
+from contextlib import asynccontextmanager
 from typing import Optional
 
 from .logging import setup_logging, get_logger
 
-
-def create_health_server(port: int = 8080, handler_class=None):
-    """
-    Create a health check HTTP server.
-    
-    Args:
-        port: Port to run health server on
-        handler_class: HTTP handler class for health checks
-        
-    Returns:
-        HTTPServer instance
-    """
-    if handler_class is None:
-        from ..utils.health import HealthCheckHandler
-        handler_class = HealthCheckHandler
-    
-    try:
-        server = HTTPServer(('0.0.0.0', port), handler_class)
-        logger = get_logger(__name__)
-        logger.info(f"Health check server created on port {port}")
-        return server
-    except Exception as e:
-        logger = get_logger(__name__)
-        logger.error(f"Failed to create health server: {e}")
-        return None
-
-
-def start_health_server_background(port: int = 8080, handler_class=None) -> Optional[threading.Thread]:
-    """
-    Start health check server in background thread.
-    
-    Args:
-        port: Port to run health server on
-        handler_class: HTTP handler class for health checks
-        
-    Returns:
-        Thread instance if successful, None otherwise
-    """
-    def _run_health_server():
-        server = create_health_server(port, handler_class)
-        if server:
-            server.serve_forever()
-    
-    try:
-        thread = threading.Thread(target=_run_health_server, daemon=True)
-        thread.start()
-        return thread
-    except Exception as e:
-        logger = get_logger(__name__)
-        logger.error(f"Failed to start health server thread: {e}")
-        return None
+# Per-request access lines cost a log record each; opt back in with UVICORN_ACCESS_LOG=true
+ACCESS_LOG = os.getenv("UVICORN_ACCESS_LOG", "false").lower() in ("1", "true", "yes")
 
 
 def create_api_server(host: str = "0.0.0.0", port: int = 8000, **kwargs):
@@ -84,23 +34,29 @@ def create_api_server(host: str = "0.0.0.0", port: int = 8000, **kwargs):
     # Test app initialization
     try:
         logger.info("Testing API app import...")
-        logger.info(f"App routes: {len(app.routes)}")
+        logger.info("App routes: %d", len(app.routes))
         logger.info("API server initialized successfully")
     except Exception as e:
-        logger.error(f"Error initializing app: {e}")
+        logger.error("Error initializing app: %s", e)
         raise
     
+    # API-only mode holds no in-process bot, so it can scale across worker processes. Defaults to
+    # one: cpu_count() sees host cores rather than the container quota, and rate limits and caches
+    # are per process, so each extra worker loosens them. Opt in with WEB_CONCURRENCY.
+    workers = int(kwargs.pop('workers', os.getenv("WEB_CONCURRENCY", "1")))
+    
     config = {
-        'app': app,
+        # uvicorn can only spawn multiple workers from an import string
+        'app': "backend.app.api.main:app" if workers > 1 else app,
         'host': host,
         'port': port,
-        'workers': 1,
-        'access_log': True,
+        'workers': workers,
+        'access_log': ACCESS_LOG,
         'log_level': "info",
         **kwargs
     }
     
-    logger.info(f"API server configuration created for {host}:{port}")
+    logger.info("API server configuration created for %s:%d with %d worker(s)", host, port, workers)
     return config
 
 
@@ -123,47 +79,48 @@ def create_combined_server(host: str = "0.0.0.0", port: int = 8000, **kwargs):
     from ..api.main import app
     from ..services.background import background_bot
     
-    # Add startup/shutdown events for background bot
-    @app.on_event("startup")
-    async def startup_event():
+    # Single entry point for the bot: start it with the server's event loop, stop it on shutdown
+    @asynccontextmanager
+    async def lifespan(_app):
         try:
-            logger.info("=== STARTUP EVENT TRIGGERED ===")
             logger.info("API server starting, launching background bot...")
             background_bot.start()
-            logger.info("=== BACKGROUND BOT START CALLED ===")
-        except Exception as e:
-            logger.error(f"Error in startup event: {e}", exc_info=True)
+        except Exception:
+            logger.error("Error starting background bot", exc_info=True)
             raise
-
-    @app.on_event("shutdown") 
-    async def shutdown_event():
         try:
-            logger.info("=== SHUTDOWN EVENT TRIGGERED ===")
-            logger.info("API server shutting down, stopping background bot...")
-            background_bot.stop()
-        except Exception as e:
-            logger.error(f"Error in shutdown event: {e}", exc_info=True)
+            yield
+        finally:
+            try:
+                logger.info("API server shutting down, stopping background bot...")
+                await background_bot.stop()
+            except Exception:
+                logger.error("Error stopping background bot", exc_info=True)
+
+    app.router.lifespan_context = lifespan
     
     # Test app initialization
     try:
         logger.info("Testing combined app import...")
-        logger.info(f"App routes: {len(app.routes)}")
+        logger.info("App routes: %d", len(app.routes))
         logger.info("Combined server initialized successfully")
     except Exception as e:
-        logger.error(f"Error initializing app: {e}")
+        logger.error("Error initializing app: %s", e)
         raise
     
+    # Single worker: the background bot is an in-process singleton. Scale the API
+    # separately by running --mode api and --mode bot as their own processes.
     config = {
         'app': app,
         'host': host,
         'port': port,
         'workers': 1,
-        'access_log': True,
+        'access_log': ACCESS_LOG,
         'log_level': "info",
         **kwargs
     }
     
-    logger.info(f"Combined server configuration created for {host}:{port}")
+    logger.info("Combined server configuration created for %s:%d", host, port)
     return config
 
 
@@ -182,7 +139,7 @@ def run_api_server(host: str = "0.0.0.0", port: Optional[int] = None, **kwargs):
     config = create_api_server(host, port, **kwargs)
     
     logger = get_logger(__name__)
-    logger.info(f"Starting API server on {host}:{port}")
+    logger.info("Starting API server on %s:%d", host, port)
     
     uvicorn.run(**config)
 
@@ -202,35 +159,26 @@ def run_combined_server(host: str = "0.0.0.0", port: Optional[int] = None, **kwa
     config = create_combined_server(host, port, **kwargs)
     
     logger = get_logger(__name__)
-    logger.info(f"Starting combined API server + bot on {host}:{port}")
-    
-    # Manually start background bot before server
-    from ..services.background import background_bot
-    logger.info("=== MANUALLY STARTING BACKGROUND BOT ===")
-    background_bot.start()
+    logger.info("Starting combined API server + bot on %s:%d", host, port)
     
+    # The background bot is started by the app's startup hook once the event loop is running
     uvicorn.run(**config)
 
 
 def run_background_bot(symbols: str = "AAPL,MSFT,JNJ,UNH,V", 
                       interval: int = 300,
-                      max_loops: Optional[int] = None,
-                      health_port: int = 8080):
+                      max_loops: Optional[int] = None):
     """
-    Run only the background trading bot with health server.
+    Run only the background trading bot.
     
     Args:
         symbols: Comma-separated trading symbols
         interval: Trading cycle interval in seconds
         max_loops: Maximum number of cycles (for testing)
-        health_port: Port for health check server
     """
     setup_logging("trading")
     logger = get_logger(__name__)
     
-    # Start health check server
-    start_health_server_background(health_port)
-    
     # Run background bot
     from ..services.background import run_background_bot_loop
     run_background_bot_loop(symbols, interval, max_loops)
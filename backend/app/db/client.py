@@ -1,23 +1,53 @@
+import threading
+import httpx
+from postgrest.utils import SyncClient
 from supabase import create_client, Client
 from .config import get_db_settings
 from typing import Optional
 
+try:
+    import h2  # noqa: F401 - lets httpx negotiate HTTP/2
+    HTTP2_AVAILABLE = True
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    HTTP2_AVAILABLE = False
+
+# Idle connections outlive a trading cycle's gaps between PostgREST calls (httpx defaults to 5s)
+POSTGREST_POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60)
+
+def configure_postgrest_session(client: Client) -> Client:
+    """Replace the client's PostgREST session with a pooled keep-alive (and HTTP/2 when available) one."""
+    postgrest = client.postgrest
+    session = postgrest.session
+    postgrest.session = SyncClient(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=session.timeout,
+        limits=POSTGREST_POOL_LIMITS,
+        http2=HTTP2_AVAILABLE
+    )
+    session.close()
+    return client
+
 class DatabaseClient:
     """Database client for Supabase operations."""
     _instance: Optional[Client] = None
+    _lock = threading.Lock()
 
     @classmethod
     def get_instance(cls) -> Client:
         """Get or create a singleton instance of the Supabase client."""
         if cls._instance is None:
-            settings = get_db_settings()
-            cls._instance = create_client(
-                settings.SUPABASE_URL,
-                settings.SUPABASE_KEY
-            )
+            # Double-checked so concurrent first callers build only one client
+            with cls._lock:
+                if cls._instance is None:
+                    settings = get_db_settings()
+                    cls._instance = configure_postgrest_session(create_client(
+                        settings.SUPABASE_URL,
+                        settings.SUPABASE_KEY
+                    ))
         return cls._instance
 
     @classmethod
     def reset_instance(cls) -> None:
         """Reset the singleton instance (useful for testing)."""
-        cls._instance = None 
\ No newline at end of file
+        cls._instance = None 
@@ -1,12 +1,15 @@
 import logging
-from typing import Optional
+from typing import Optional, Set
 from datetime import datetime, UTC
 from .client import DatabaseClient
 from .models import Trade, Position, Equity, Signal
+from .operations import batched_insert, to_row
 from ..core.config import load_config
 
 logger = logging.getLogger(__name__)
 
+APP_TABLES = ('trades', 'positions', 'equity', 'signals')
+
 def init_database() -> bool:
     """
     Initialize the database with required tables and initial data.
@@ -28,42 +31,47 @@ def init_database() -> bool:
         logger.error(f"Database initialization failed: {e}", exc_info=True)
         return False
 
-def _create_tables(client) -> None:
-    """Create database tables if they don't exist."""
-    try:
-        # Create trades table
-        client.table('trades').select('count').limit(1).execute()
-        logger.info("Trades table exists")
-    except Exception:
-        logger.info("Creating trades table...")
-        client.table('trades').create().execute()
-    
+def _existing_tables(client) -> Optional[Set[str]]:
+    """Return public table names via a single RPC, or None if the helper isn't deployed."""
     try:
-        # Create positions table
-        client.table('positions').select('count').limit(1).execute()
-        logger.info("Positions table exists")
-    except Exception:
-        logger.info("Creating positions table...")
-        client.table('positions').create().execute()
-    
-    try:
-        # Create equity table
-        client.table('equity').select('count').limit(1).execute()
-        logger.info("Equity table exists")
-    except Exception:
-        logger.info("Creating equity table...")
-        client.table('equity').create().execute()
-    
+        result = client.rpc('existing_tables', {}).execute()
+    except Exception as e:
+        logger.warning(f"existing_tables RPC unavailable, probing tables individually: {e}")
+        return None
+    return set(result.data or [])
+
+def _table_exists(client, table: str) -> bool:
+    """Probe a single table with a one-row query."""
     try:
-        # Create signals table
-        client.table('signals').select('count').limit(1).execute()
-        logger.info("Signals table exists")
+        client.table(table).select('count').limit(1).execute()
+        return True
     except Exception:
-        logger.info("Creating signals table...")
-        client.table('signals').create().execute()
+        return False
+
+def _create_tables(client) -> None:
+    """Create database tables if they don't exist."""
+    existing = _existing_tables(client)
+    for table in APP_TABLES:
+        exists = table in existing if existing is not None else _table_exists(client, table)
+        if exists:
+            logger.info(f"{table.capitalize()} table exists")
+            continue
+        logger.info(f"Creating {table} table...")
+        client.table(table).create().execute()
 
 def _init_equity(client, starting_equity: float) -> None:
-    """Initialize equity table with starting value if empty."""
+    """Initialize equity table with starting value if empty, in a single RPC when available."""
+    try:
+        result = client.rpc('ensure_initial_equity', {'starting_equity': starting_equity}).execute()
+    except Exception as e:
+        logger.warning(f"ensure_initial_equity RPC unavailable, checking equity rows directly: {e}")
+        _init_equity_direct(client, starting_equity)
+        return
+    if result.data is True:
+        logger.info(f"Initialized equity with {starting_equity}")
+
+def _init_equity_direct(client, starting_equity: float) -> None:
+    """Count equity rows and insert the starting value if there are none."""
     try:
         result = client.table('equity').select('count').execute()
         if result.data[0]['count'] == 0:
@@ -72,11 +80,7 @@ def _init_equity(client, starting_equity: float) -> None:
                 equity=starting_equity,
                 cash=starting_equity
             )
-            # Convert datetime to serializable format
-            data = initial_equity.model_dump(exclude={'id'})
-            if 'timestamp' in data and hasattr(data['timestamp'], 'isoformat'):
-                data['timestamp'] = data['timestamp'].isoformat()
-            client.table('equity').insert(data).execute()
+            batched_insert(client, 'equity', [to_row(initial_equity)])
             logger.info(f"Initialized equity with {starting_equity}")
     except Exception as e:
         logger.error(f"Failed to initialize equity: {e}")
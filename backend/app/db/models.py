@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, UTC
 from typing import Optional
 from pydantic import BaseModel, Field
 
@@ -10,7 +10,7 @@ class Trade(BaseModel):
     side: str  # 'buy' or 'sell'
     quantity: float
     price: float
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
     strategy: str
     profit_loss: Optional[float] = None
     status: str = 'completed'  # 'pending', 'completed', 'failed'
@@ -23,12 +23,12 @@ class Position(BaseModel):
     average_entry_price: float
     current_price: float
     unrealized_pnl: float
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
 class Equity(BaseModel):
     """Model for equity curve data."""
     id: Optional[int] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
     equity: float
     cash: float
 
@@ -38,6 +38,6 @@ class Signal(BaseModel):
     symbol: str
     signal_type: str  # 'buy', 'sell', 'hold'
     strength: float  # 0 to 1
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
     strategy: str
     price: float 
@@ -1,5 +1,11 @@
-from typing import List, Optional
-from datetime import datetime
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
+from datetime import datetime, timedelta, UTC
+from pydantic import BaseModel
 from .client import DatabaseClient
 from .models import Trade, Position, Equity, Signal
 
@@ -10,48 +16,204 @@ def to_serializable(data: dict) -> dict:
             data[k] = v.isoformat()
     return data
 
+logger = logging.getLogger(__name__)
+
+# Writes whose result the caller doesn't wait on run here, off the trading loop's critical path
+_writer_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="db-write")
+
+def _log_write_failure(future: Future) -> None:
+    error = future.exception()
+    if error is not None:
+        logger.error("Background database write failed", exc_info=error)
+
+def submit_write(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """Run a database write on the shared writer pool; failures are logged, not raised."""
+    future = _writer_pool.submit(func, *args, **kwargs)
+    future.add_done_callback(_log_write_failure)
+    return future
+
+# Short-lived cache for read methods polled with identical arguments. Every write
+# bumps its table's version, which is part of the key, so stale rows are never served.
+READ_CACHE_TTL = 2.0
+READ_CACHE_MAXSIZE = 256
+_read_cache: Dict[tuple, Tuple[float, list]] = {}
+_table_versions: Dict[str, int] = {}
+_read_cache_lock = threading.Lock()
+
+def invalidate_table(table: str) -> None:
+    """Mark cached reads of `table` stale; call after any write to it."""
+    with _read_cache_lock:
+        _table_versions[table] = _table_versions.get(table, 0) + 1
+
+def clear_read_cache() -> None:
+    """Drop every cached read (useful for testing)."""
+    with _read_cache_lock:
+        _read_cache.clear()
+
+def cached_read(table: str):
+    """Cache a DatabaseOperations read for READ_CACHE_TTL seconds per argument set."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args: Any, **kwargs: Any) -> list:
+            now = time.monotonic()
+            with _read_cache_lock:
+                key = (func.__name__, _table_versions.get(table, 0), args, tuple(sorted(kwargs.items())))
+                hit = _read_cache.get(key)
+                if hit is not None and now - hit[0] < READ_CACHE_TTL:
+                    return list(hit[1])
+
+            result = func(self, *args, **kwargs)
+
+            with _read_cache_lock:
+                if len(_read_cache) >= READ_CACHE_MAXSIZE:
+                    for stale in [k for k, (at, _) in _read_cache.items() if now - at >= READ_CACHE_TTL]:
+                        del _read_cache[stale]
+                    if len(_read_cache) >= READ_CACHE_MAXSIZE:
+                        _read_cache.clear()
+                _read_cache[key] = (now, result)
+            return list(result)
+        return wrapper
+    return decorator
+
+def batched_insert(
+    client,
+    table: str,
+    rows: Iterable[dict],
+    chunk: int = 500,
+    on_conflict: Optional[str] = None
+) -> List[dict]:
+    """Insert rows as JSON arrays, one request per `chunk` rows instead of one per row.
+
+    With `on_conflict`, rows are upserted on those columns instead.
+    """
+    rows = [to_serializable(dict(row)) for row in rows]
+    inserted: List[dict] = []
+    for start in range(0, len(rows), chunk):
+        batch = rows[start:start + chunk]
+        query = client.table(table)
+        query = query.upsert(batch, on_conflict=on_conflict) if on_conflict else query.insert(batch)
+        inserted.extend(query.execute().data or [])
+    invalidate_table(table)
+    return inserted
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+# Read projections: only the columns each model declares, not created_at/updated_at or future extras
+_TRADE_COLS = ','.join(Trade.model_fields)
+
+# Newest first with id breaking timestamp ties; PostgREST takes one comma-separated order list,
+# so pass this to order(..., desc=True), which appends the last column's direction
+TRADES_NEWEST_FIRST = 'timestamp.desc,id'
+
+def trades_before(query, before: datetime, before_id: Optional[int] = None):
+    """Restrict a newest-first trades query to rows after the (timestamp, id) cursor.
+
+    Without `before_id` only the timestamp is compared, so rows sharing it are skipped.
+    """
+    timestamp = before.isoformat()
+    if before_id is None:
+        return query.lt('timestamp', timestamp)
+    # This postgrest-py has no or_() filter, so the logic tree goes on the params directly;
+    # the timestamp is quoted because it contains PostgREST's reserved '.' and ':'
+    query.params = query.params.add(
+        'or', f'(timestamp.lt."{timestamp}",and(timestamp.eq."{timestamp}",id.lt.{before_id}))'
+    )
+    return query
+_POSITION_COLS = ','.join(Position.model_fields)
+_EQUITY_COLS = ','.join(Equity.model_fields)
+_SIGNAL_COLS = ','.join(Signal.model_fields)
+
+# Rows never carry the serial id; built once rather than per call
+_EXCLUDE_ID = {'id'}
+
+def to_row(model: BaseModel) -> dict:
+    """Dump a model for PostgREST, letting pydantic render datetimes as ISO strings."""
+    return model.model_dump(mode='json', exclude=_EXCLUDE_ID)
+
 class DatabaseOperations:
-    """Database operations for Supabase."""
+    """Database operations for Supabase.
+
+    Read methods build models with model_construct: rows come straight from the
+    table schema, so pydantic validation is skipped and timestamps stay ISO strings.
+    """
     
     def __init__(self):
         self.client = DatabaseClient.get_instance()
 
+    def _iter_rows(self, build_query: Callable[[], Any], model: Type[ModelT], chunk: int) -> Iterator[ModelT]:
+        """Page through `build_query()` ordered oldest first, yielding one model per row.
+
+        Ascending order keeps offsets stable while new rows are appended during the scan.
+        """
+        offset = 0
+        while True:
+            rows = build_query().order('timestamp').range(offset, offset + chunk - 1).execute().data or []
+            for row in rows:
+                yield model.model_construct(**row)
+            if len(rows) < chunk:
+                return
+            offset += chunk
+
     def create_trade(self, trade: Trade) -> Trade:
         """Create a new trade record."""
-        data = to_serializable(trade.model_dump(exclude={'id'}))
+        data = to_row(trade)
         result = self.client.table('trades').insert(data).execute()
+        invalidate_table('trades')
         return Trade(**result.data[0])
 
+    def create_trades_bulk(self, trades: List[Trade], chunk: int = 500) -> List[Trade]:
+        """Create many trade records with one multi-row insert per chunk."""
+        rows = [to_row(trade) for trade in trades]
+        return [Trade(**row) for row in batched_insert(self.client, 'trades', rows, chunk)]
+
     def get_trades(
         self,
         limit: int = 100,
         offset: int = 0,
-        symbol: Optional[str] = None
+        symbol: Optional[str] = None,
+        before: Optional[datetime] = None,
+        before_id: Optional[int] = None
     ) -> List[Trade]:
-        """Get trade history with optional filtering."""
-        query = self.client.table('trades').select('*')
+        """Get trade history with optional filtering.
+
+        Pass the last row's timestamp and id as `before`/`before_id` to fetch the next page
+        with an index range scan; `offset` paging makes Postgres walk every skipped row.
+        """
+        query = self.client.table('trades').select(_TRADE_COLS)
         if symbol:
             query = query.eq('symbol', symbol)
-        result = query.order('timestamp', desc=True).range(offset, offset+limit-1).execute()
-        return [Trade(**trade) for trade in result.data]
+        query = query.order(TRADES_NEWEST_FIRST, desc=True)
+        if before is not None:
+            result = trades_before(query, before, before_id).limit(limit).execute()
+        else:
+            result = query.range(offset, offset+limit-1).execute()
+        return [Trade.model_construct(**trade) for trade in result.data]
+
+    def iter_trades(self, symbol: Optional[str] = None, chunk: int = 1000) -> Iterator[Trade]:
+        """Stream trade history oldest first, `chunk` rows per request."""
+        def build_query():
+            query = self.client.table('trades').select(_TRADE_COLS)
+            return query.eq('symbol', symbol) if symbol else query
+        return self._iter_rows(build_query, Trade, chunk)
 
+    @cached_read('trades')
     def get_recent_trades(self, symbol: str, days: int = 1) -> List[Trade]:
         """Get recent trades for a symbol within the last N days."""
-        from datetime import datetime, timedelta
-        cutoff_time = datetime.now() - timedelta(days=days)
+        cutoff_time = datetime.now(UTC) - timedelta(days=days)
         
+        # Served by idx_trades_symbol_timestamp, scanned backwards for the DESC order
         query = (
             self.client.table('trades')
-            .select('*')
+            .select(_TRADE_COLS)
             .eq('symbol', symbol)
             .gte('timestamp', cutoff_time.isoformat())
         )
         result = query.order('timestamp', desc=True).execute()
-        return [Trade(**trade) for trade in result.data]
+        return [Trade.model_construct(**trade) for trade in result.data]
 
     def update_position(self, position: Position) -> Position:
         """Update or create a position using upsert."""
-        data = to_serializable(position.model_dump(exclude={'id'}))
+        data = to_row(position)
         result = (
             self.client.table('positions')
             .upsert(data, on_conflict='symbol')
@@ -61,51 +223,87 @@ class DatabaseOperations:
 
     def get_positions(self) -> List[Position]:
         """Get all current positions."""
-        result = self.client.table('positions').select('*').execute()
-        return [Position(**pos) for pos in result.data]
+        result = self.client.table('positions').select(_POSITION_COLS).execute()
+        return [Position.model_construct(**pos) for pos in result.data]
 
     def record_equity(self, equity: Equity) -> Equity:
         """Record equity curve data point with upsert on timestamp."""
-        data = to_serializable(equity.model_dump(exclude={'id'}))
+        data = to_row(equity)
         result = (
             self.client.table('equity')
             .upsert(data, on_conflict='timestamp')
             .execute()
         )
+        invalidate_table('equity')
         return Equity(**result.data[0])
 
+    @cached_read('equity')
     def get_equity_history(
         self,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None
     ) -> List[Equity]:
         """Get equity curve history with optional time range."""
-        query = self.client.table('equity').select('*')
+        query = self.client.table('equity').select(_EQUITY_COLS)
         if start_time:
             query = query.gte('timestamp', start_time.isoformat())
         if end_time:
             query = query.lte('timestamp', end_time.isoformat())
         result = query.order('timestamp').execute()
-        return [Equity(**equity) for equity in result.data]
+        return [Equity.model_construct(**equity) for equity in result.data]
+
+    def iter_equity_history(
+        self,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        chunk: int = 1000
+    ) -> Iterator[Equity]:
+        """Stream the equity curve oldest first, `chunk` rows per request."""
+        def build_query():
+            query = self.client.table('equity').select(_EQUITY_COLS)
+            if start_time:
+                query = query.gte('timestamp', start_time.isoformat())
+            if end_time:
+                query = query.lte('timestamp', end_time.isoformat())
+            return query
+        return self._iter_rows(build_query, Equity, chunk)
 
     def create_signal(self, signal: Signal) -> Signal:
         """Create a new trading signal with upsert on composite key."""
-        data = to_serializable(signal.model_dump(exclude={'id'}))
+        data = to_row(signal)
         result = (
             self.client.table('signals')
             .upsert(data, on_conflict='symbol,timestamp,strategy')
             .execute()
         )
+        invalidate_table('signals')
         return Signal(**result.data[0])
 
+    def create_signals_bulk(self, signals: List[Signal], chunk: int = 500) -> List[Signal]:
+        """Upsert many trading signals with one multi-row request per chunk."""
+        rows = [to_row(signal) for signal in signals]
+        created = batched_insert(
+            self.client, 'signals', rows, chunk, on_conflict='symbol,timestamp,strategy'
+        )
+        return [Signal(**row) for row in created]
+
+    @cached_read('signals')
     def get_latest_signals(
         self,
         symbol: Optional[str] = None,
         limit: int = 10
     ) -> List[Signal]:
         """Get latest trading signals with optional symbol filter."""
-        query = self.client.table('signals').select('*')
+        # With a symbol, the UNIQUE(symbol, timestamp, strategy) index covers filter and order
+        query = self.client.table('signals').select(_SIGNAL_COLS)
         if symbol:
             query = query.eq('symbol', symbol)
         result = query.order('timestamp', desc=True).limit(limit).execute()
-        return [Signal(**signal) for signal in result.data] 
\ No newline at end of file
+        return [Signal.model_construct(**signal) for signal in result.data]
+
+    def iter_signals(self, symbol: Optional[str] = None, chunk: int = 1000) -> Iterator[Signal]:
+        """Stream signal history oldest first, `chunk` rows per request."""
+        def build_query():
+            query = self.client.table('signals').select(_SIGNAL_COLS)
+            return query.eq('symbol', symbol) if symbol else query
+        return self._iter_rows(build_query, Signal, chunk)
@@ -54,6 +54,7 @@ CREATE TABLE IF NOT EXISTS signals (
 -- Create indexes
 CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol);
 CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp);
+CREATE INDEX IF NOT EXISTS idx_trades_timestamp_id ON trades(timestamp, id);
 CREATE INDEX IF NOT EXISTS idx_trades_symbol_timestamp ON trades(symbol, timestamp);
 CREATE INDEX IF NOT EXISTS idx_positions_symbol ON positions(symbol);
 CREATE INDEX IF NOT EXISTS idx_equity_timestamp ON equity(timestamp);
@@ -73,4 +74,104 @@ $$ language 'plpgsql';
 CREATE TRIGGER update_positions_updated_at
     BEFORE UPDATE ON positions
     FOR EACH ROW
-    EXECUTE FUNCTION update_updated_at_column(); 
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Positions with derived fields, shaped for the portfolio API
+CREATE OR REPLACE VIEW positions_enriched AS
+SELECT
+    symbol,
+    quantity::FLOAT8 AS quantity,
+    average_entry_price::FLOAT8 AS avg_price,
+    current_price::FLOAT8 AS current_price,
+    (quantity * current_price)::FLOAT8 AS market_value,
+    unrealized_pnl::FLOAT8 AS unrealized_pl,
+    timestamp
+FROM positions;
+
+-- Portfolio summary in one round-trip: enriched positions plus total unrealized P/L
+CREATE OR REPLACE FUNCTION get_portfolio_summary()
+RETURNS JSON AS $$
+    SELECT json_build_object(
+        'positions', COALESCE((SELECT json_agg(p ORDER BY p.symbol) FROM positions_enriched p), '[]'::JSON),
+        'total_pl', COALESCE((SELECT SUM(unrealized_pnl) FROM positions), 0)::FLOAT8
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Public table names in one round-trip, used by startup initialization
+CREATE OR REPLACE FUNCTION existing_tables()
+RETURNS TEXT[] AS $$
+    SELECT COALESCE(array_agg(table_name::TEXT), '{}')
+    FROM information_schema.tables
+    WHERE table_schema = 'public';
+$$ LANGUAGE sql STABLE;
+
+-- Seed the equity curve in one round-trip; the advisory lock keeps concurrent initializers from double-inserting
+CREATE OR REPLACE FUNCTION ensure_initial_equity(starting_equity FLOAT8)
+RETURNS BOOLEAN AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_initial_equity'));
+    IF EXISTS (SELECT 1 FROM equity) THEN
+        RETURN FALSE;
+    END IF;
+    INSERT INTO equity (timestamp, equity, cash) VALUES (NOW(), starting_equity, starting_equity);
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Single-row lease so only one standalone bot replica trades at a time
+CREATE TABLE IF NOT EXISTS bot_lease (
+    id INT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    holder TEXT NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+-- Claim the lease when it is free or expired, or renew it for the current holder
+CREATE OR REPLACE FUNCTION acquire_bot_lease(holder_id TEXT, ttl_seconds INT)
+RETURNS BOOLEAN AS $$
+BEGIN
+    INSERT INTO bot_lease (id, holder, expires_at)
+    VALUES (1, holder_id, NOW() + make_interval(secs => ttl_seconds))
+    ON CONFLICT (id) DO UPDATE
+        SET holder = EXCLUDED.holder, expires_at = EXCLUDED.expires_at
+        WHERE bot_lease.holder = EXCLUDED.holder OR bot_lease.expires_at < NOW();
+    RETURN FOUND;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Persist a trading cycle's trade, position and equity rows in one transaction and one round-trip
+-- Drop the earlier three-argument version so PostgREST never sees two overloads
+DROP FUNCTION IF EXISTS commit_trade_cycle(JSONB, JSONB, JSONB);
+
+CREATE OR REPLACE FUNCTION commit_trade_cycle(
+    trade_row JSONB, position_row JSONB, equity_row JSONB, closed_symbol TEXT DEFAULT NULL
+)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO trades (order_id, symbol, side, quantity, price, timestamp, strategy, profit_loss, status)
+    SELECT order_id, symbol, side, quantity, price, COALESCE(timestamp, NOW()), strategy, profit_loss,
+           COALESCE(status, 'completed')
+    FROM jsonb_populate_record(NULL::trades, trade_row);
+
+    -- A fully closed position loses its row, so the next cycle doesn't value it again
+    IF closed_symbol IS NOT NULL THEN
+        DELETE FROM positions WHERE symbol = closed_symbol;
+    END IF;
+
+    IF position_row IS NOT NULL THEN
+        INSERT INTO positions (symbol, quantity, average_entry_price, current_price, unrealized_pnl, timestamp)
+        SELECT symbol, quantity, average_entry_price, current_price, unrealized_pnl, COALESCE(timestamp, NOW())
+        FROM jsonb_populate_record(NULL::positions, position_row)
+        ON CONFLICT (symbol) DO UPDATE SET
+            quantity = EXCLUDED.quantity,
+            average_entry_price = EXCLUDED.average_entry_price,
+            current_price = EXCLUDED.current_price,
+            unrealized_pnl = EXCLUDED.unrealized_pnl,
+            timestamp = EXCLUDED.timestamp;
+    END IF;
+
+    INSERT INTO equity (timestamp, equity, cash)
+    SELECT timestamp, equity, cash
+    FROM jsonb_populate_record(NULL::equity, equity_row)
+    ON CONFLICT (timestamp) DO UPDATE SET equity = EXCLUDED.equity, cash = EXCLUDED.cash;
+END;
+$$ LANGUAGE plpgsql;
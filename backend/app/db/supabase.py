@@ -1,10 +1,21 @@
 import os
+import json
 import logging
 import requests
-from typing import Dict, List, Optional
-from datetime import datetime, UTC
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+from datetime import datetime, timedelta, UTC
 from supabase import create_client, Client
 from ..core.config import load_config
+from .client import configure_postgrest_session
+from .operations import invalidate_table
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -12,52 +23,82 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 TEST_MODE = os.getenv("TEST_MODE", "false").lower() == "true"
 
+# Endpoint URLs are fixed for the process, so build them once rather than per call
+_URL_TRADES, _URL_POSITIONS, _URL_EQUITY, _URL_SIGNALS, _URL_CREATE_TABLE, _URL_COMMIT_CYCLE = (
+    f"{SUPABASE_URL}/rest/v1/{path}"
+    for path in ("trades", "positions", "equity", "signals", "rpc/create_table", "rpc/commit_trade_cycle")
+)
+
 HEADERS = {
     "apikey": SUPABASE_KEY or "",
     "Content-Type": "application/json"
 }
 
-_supabase_client: Optional[Client] = None
+# Required keys per table, checked with one set comparison per write
+_TRADE_REQUIRED = frozenset(('symbol', 'side', 'quantity', 'status', 'order_id', 'price', 'strategy'))
+_POSITION_REQUIRED = frozenset(('symbol', 'quantity', 'average_entry_price'))
+_EQUITY_REQUIRED = frozenset(('equity', 'cash', 'timestamp'))
+_SIGNAL_REQUIRED = frozenset(('symbol', 'signal_type', 'strength', 'strategy', 'price'))
+
+# One keep-alive pool for every REST call below; retries cover transient gateway errors
+# (urllib3 does not retry POSTs by default, so writes are never replayed)
+_session = requests.Session()
+_session.headers.update(HEADERS)
+_session.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+))
+
+def _json_default(value):
+    """Fallback encoder for values stdlib json can't handle (datetimes, numpy scalars)."""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _dump_json(payload) -> bytes:
+    """Encode a request body, in C via orjson when installed."""
+    if orjson is not None:
+        # Naive datetimes are UTC throughout the bot; broker prices may be numpy scalars
+        return orjson.dumps(payload, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, default=_json_default).encode()
 
+@lru_cache(maxsize=1)
 def get_supabase_client() -> Client:
     """
     Get or create a Supabase client instance.
-    Uses singleton pattern to avoid creating multiple clients.
+    Memoized so the client (and its HTTP session) is built once per process;
+    call get_supabase_client.cache_clear() to force a rebuild.
     """
-    global _supabase_client
+    config = load_config()
+    url = config.get("SUPABASE_URL")
+    key = config.get("SUPABASE_KEY")
+    test_mode = config.get("TEST_MODE", False)
     
-    if _supabase_client is None:
-        config = load_config()
-        url = config.get("SUPABASE_URL")
-        key = config.get("SUPABASE_KEY")
-        test_mode = config.get("TEST_MODE", False)
-        
-        if not url or not key:
-            raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment variables")
-        
-        # In test mode, use mock values that pass Supabase validation
-        if test_mode:
-            # Use realistic test values that pass Supabase's API key validation
-            url = "https://test.supabase.co"
-            key = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZSIsInJlZiI6InRlc3QiLCJyb2xlIjoiYW5vbiIsImlhdCI6MTY0MTQwODAwMCwiZXhwIjoxOTU2OTg0MDAwfQ.test_key"
-        
-        _supabase_client = create_client(url, key)
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment variables")
     
-    return _supabase_client
+    # In test mode, use mock values that pass Supabase validation
+    if test_mode:
+        # Use realistic test values that pass Supabase's API key validation
+        url = "https://test.supabase.co"
+        key = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZSIsInJlZiI6InRlc3QiLCJyb2xlIjoiYW5vbiIsImlhdCI6MTY0MTQwODAwMCwiZXhwIjoxOTU2OTg0MDAwfQ.test_key"
+    
+    return configure_postgrest_session(create_client(url, key))
 
 def validate_trade_data(trade_data: Dict) -> bool:
     """
     Validate trade data before writing to database.
     """
-    required_fields = ['symbol', 'side', 'quantity', 'status', 'order_id', 'price', 'strategy']
-    return all(field in trade_data for field in required_fields)
+    return _TRADE_REQUIRED <= trade_data.keys()
 
 def validate_position_data(position_data: Dict) -> bool:
     """
     Validate position data before writing to database.
     """
-    required_fields = ['symbol', 'quantity', 'average_entry_price']
-    if not all(field in position_data for field in required_fields):
+    if not _POSITION_REQUIRED <= position_data.keys():
         return False
     try:
         float(position_data['average_entry_price'])
@@ -69,90 +110,74 @@ def validate_equity_data(equity_data: Dict) -> bool:
     """
     Validate equity data before writing to database.
     """
-    required_fields = ['equity', 'cash', 'timestamp']
-    return all(field in equity_data for field in required_fields)
+    return _EQUITY_REQUIRED <= equity_data.keys()
 
-def setup_tables():
+def _send(method: str, url: str, action: str, **kwargs) -> Optional[requests.Response]:
     """
-    Set up Supabase/Postgres tables for trades, positions, and equity.
+    Send one REST call through the shared session.
+    Returns the raw response whatever its status, or None after logging a transport error.
     """
-    tables = ["trades", "positions", "equity"]
-    for table in tables:
-        try:
-            response = requests.post(
-                f"{SUPABASE_URL}/rest/v1/rpc/create_table",
-                headers=HEADERS,
-                json={"table_name": table}
-            )
-            if response.status_code == 200:
-                logger.info(f"Table {table} created or already exists.")
-            else:
-                logger.error(f"Failed to create table {table}: {response.text}")
-        except Exception as e:
-            logger.error(f"Error setting up table {table}: {e}")
+    try:
+        return getattr(_session, method)(url, **kwargs)
+    except Exception as e:
+        logger.error("Error trying to %s: %s", action, e)
+        return None
 
-def read_trades(symbol: Optional[str] = None, limit: int = 100) -> List[Dict]:
+def _do(method: str, url: str, action: str, **kwargs):
     """
-    Read trades from Supabase/Postgres.
+    Send one REST call through the shared session.
+    Returns the decoded body for GETs and True for writes, or None after logging any failure.
     """
+    ok_statuses = (200,) if method == "get" else (200, 201, 204)
+    response = _send(method, url, action, **kwargs)
+    if response is None:
+        return None
     try:
-        url = f"{SUPABASE_URL}/rest/v1/trades"
-        params = {"limit": limit}
-        if symbol:
-            params["symbol"] = f"eq.{symbol}"
-            
-        response = requests.get(url, headers=HEADERS, params=params)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            logger.error(f"Failed to read trades: {response.text}")
+        if response.status_code not in ok_statuses:
+            logger.error("Failed to %s: %s - %s", action, response.status_code, response.text)
             return None
+        return response.json() if method == "get" else True
     except Exception as e:
-        logger.error(f"Error reading trades: {e}")
+        logger.error("Error trying to %s: %s", action, e)
         return None
 
+def setup_tables():
+    """
+    Set up Supabase/Postgres tables for trades, positions, and equity.
+    """
+    for table in ("trades", "positions", "equity"):
+        if _do("post", _URL_CREATE_TABLE, f"create table {table}", data=_dump_json({"table_name": table})):
+            logger.info("Table %s created or already exists.", table)
+
+def read_trades(symbol: Optional[str] = None, limit: int = 100) -> List[Dict]:
+    """
+    Read trades from Supabase/Postgres.
+    """
+    params = {"limit": limit}
+    if symbol:
+        params["symbol"] = f"eq.{symbol}"
+    return _do("get", _URL_TRADES, "read trades", params=params)
+
 def read_positions(symbol: Optional[str] = None) -> List[Dict]:
     """
     Read positions from Supabase/Postgres.
     """
-    try:
-        url = f"{SUPABASE_URL}/rest/v1/positions"
-        params = {}
-        if symbol:
-            params["symbol"] = f"eq.{symbol}"
-            
-        response = requests.get(url, headers=HEADERS, params=params)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            logger.error(f"Failed to read positions: {response.text}")
-            return []
-    except Exception as e:
-        logger.error(f"Error reading positions: {e}")
-        return []
+    params = {"symbol": f"eq.{symbol}"} if symbol else {}
+    return _do("get", _URL_POSITIONS, "read positions", params=params) or []
 
 def read_equity_history(days: int = 30) -> List[Dict]:
     """
-    Read equity history from Supabase/Postgres.
+    Read the last `days` days of equity history from Supabase/Postgres.
     """
-    try:
-        url = f"{SUPABASE_URL}/rest/v1/equity"
-        params = {
-            "order": "timestamp.desc",
-            "limit": days
-        }
-        
-        response = requests.get(url, headers=HEADERS, params=params)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            logger.error(f"Failed to read equity history: {response.text}")
-            return []
-    except Exception as e:
-        logger.error(f"Error reading equity history: {e}")
-        return []
+    # Range filter on the bare column so Postgres can scan the timestamp index
+    cutoff = (datetime.now(UTC) - timedelta(days=days)).isoformat()
+    params = {
+        "timestamp": f"gte.{cutoff}",
+        "order": "timestamp.desc"
+    }
+    return _do("get", _URL_EQUITY, "read equity history", params=params) or []
 
-def update_trades(trade_result: Dict) -> bool:
+def _update_trades(trade_result: Dict) -> bool:
     """
     Write trade result to Supabase/Postgres.
     Returns True if successful, False otherwise.
@@ -161,27 +186,13 @@ def update_trades(trade_result: Dict) -> bool:
         logger.error("Invalid trade data")
         return False
 
-    if TEST_MODE:
-        logger.info("Test mode: Skipping trade update")
-        return True
-
-    try:
-        response = requests.post(
-            f"{SUPABASE_URL}/rest/v1/trades",
-            headers=HEADERS,
-            json=trade_result
-        )
-        if response.status_code in [200, 201]:
-            logger.info("Trade updated successfully")
-            return True
-        else:
-            logger.error(f"Failed to update trade: {response.text}")
-            return False
-    except Exception as e:
-        logger.error(f"Error updating trade: {e}")
+    if not _do("post", _URL_TRADES, "update trade", data=_dump_json(trade_result)):
         return False
+    invalidate_table("trades")
+    logger.info("Trade updated successfully")
+    return True
 
-def update_positions(trade_result: Dict) -> bool:
+def _update_positions(trade_result: Dict) -> bool:
     """
     Write position update to Supabase/Postgres.
     Returns True if successful, False otherwise.
@@ -190,27 +201,22 @@ def update_positions(trade_result: Dict) -> bool:
         logger.error("Invalid position data")
         return False
 
-    if TEST_MODE:
-        logger.info("Test mode: Skipping position update")
-        return True
+    if not _do("post", _URL_POSITIONS, "update position", data=_dump_json(trade_result)):
+        return False
+    logger.info("Position updated successfully")
+    return True
 
-    try:
-        response = requests.post(
-            f"{SUPABASE_URL}/rest/v1/positions",
-            headers=HEADERS,
-            json=trade_result
-        )
-        if response.status_code in [200, 201]:
-            logger.info("Position updated successfully")
-            return True
-        else:
-            logger.error(f"Failed to update position: {response.text}")
-            return False
-    except Exception as e:
-        logger.error(f"Error updating position: {e}")
+def _close_position(symbol: str) -> bool:
+    """
+    Delete a fully closed position's row from Supabase/Postgres.
+    Returns True if successful, False otherwise.
+    """
+    if not _do("delete", _URL_POSITIONS, "close position", params={"symbol": f"eq.{symbol}"}):
         return False
+    logger.info("Position closed successfully")
+    return True
 
-def update_equity(trade_result: Dict) -> bool:
+def _update_equity(trade_result: Dict) -> bool:
     """
     Write equity update to Supabase/Postgres.
     Returns True if successful, False otherwise.
@@ -219,34 +225,19 @@ def update_equity(trade_result: Dict) -> bool:
         logger.error("Invalid equity data")
         return False
 
-    if TEST_MODE:
-        logger.info("Test mode: Skipping equity update")
-        return True
-
-    try:
-        response = requests.post(
-            f"{SUPABASE_URL}/rest/v1/equity",
-            headers=HEADERS,
-            json=trade_result
-        )
-        if response.status_code in [200, 201]:
-            logger.info("Equity updated successfully")
-            return True
-        else:
-            logger.error(f"Failed to update equity: {response.text}")
-            return False
-    except Exception as e:
-        logger.error(f"Error updating equity: {e}")
+    if not _do("post", _URL_EQUITY, "update equity", data=_dump_json(trade_result)):
         return False
+    invalidate_table("equity")
+    logger.info("Equity updated successfully")
+    return True
 
 def validate_signal_data(signal_data: Dict) -> bool:
     """
     Validate signal data before writing to database.
     """
-    required_fields = ['symbol', 'signal_type', 'strength', 'strategy', 'price']
-    return all(field in signal_data for field in required_fields)
+    return _SIGNAL_REQUIRED <= signal_data.keys()
 
-def update_signals(signal_data: Dict) -> bool:
+def _update_signals(signal_data: Dict) -> bool:
     """
     Write signal data to Supabase/Postgres signals table.
     Returns True if successful, False otherwise.
@@ -255,28 +246,99 @@ def update_signals(signal_data: Dict) -> bool:
         logger.error("Invalid signal data")
         return False
 
-    if TEST_MODE:
-        logger.info("Test mode: Skipping signal update")
-        return True
+    # Add timestamp if not provided
+    if 'timestamp' not in signal_data:
+        signal_data['timestamp'] = datetime.now(UTC).isoformat()
 
+    if not _do("post", _URL_SIGNALS, "store signal", data=_dump_json(signal_data)):
+        logger.error("Signal data attempted: %s", signal_data)
+        return False
+    invalidate_table("signals")
+    logger.info("Signal stored successfully")
+    return True
+
+def _valid_cycle(
+    trade_result: Dict, position_data: Optional[Dict], equity_data: Dict, closed_symbol: Optional[str] = None
+) -> bool:
+    """
+    Validate every row of a trading cycle, logging when any of them is malformed.
+    """
+    valid = (
+        bool(trade_result) and validate_trade_data(trade_result)
+        and (position_data is None or validate_position_data(position_data))
+        and bool(equity_data) and validate_equity_data(equity_data)
+    )
+    if not valid:
+        logger.error("Invalid trading cycle data")
+    return valid
+
+def _function_missing(response: requests.Response) -> bool:
+    """
+    True when PostgREST reports that the called function doesn't exist (404 / PGRST202).
+    """
+    if response.status_code == 404:
+        return True
     try:
-        # Add timestamp if not provided
-        if 'timestamp' not in signal_data:
-            signal_data['timestamp'] = datetime.now(UTC).isoformat()
-        
-        response = requests.post(
-            f"{SUPABASE_URL}/rest/v1/signals",
-            headers=HEADERS,
-            json=signal_data
-        )
-        if response.status_code in [200, 201]:
-            logger.info("Signal stored successfully")
-            return True
-        else:
-            logger.error(f"Failed to store signal: {response.status_code} - {response.text}")
-            logger.error(f"Signal data attempted: {signal_data}")
-            logger.error(f"Supabase URL: {SUPABASE_URL}")
+        return response.json().get("code") == "PGRST202"
+    except Exception:
+        return False
+
+def _commit_cycle(
+    trade_result: Dict, position_data: Optional[Dict], equity_data: Dict, closed_symbol: Optional[str] = None
+) -> bool:
+    """
+    Write a trading cycle's trade, position and equity rows in one transaction and one round-trip.
+    Pass position_data=None to leave the position row as is, and closed_symbol when the trade
+    closed the position so its row is deleted. Falls back to the per-table writers if the
+    commit_trade_cycle function isn't deployed.
+    Returns True if every row was written, False otherwise.
+    """
+    if not _valid_cycle(trade_result, position_data, equity_data):
+        return False
+
+    payload = {
+        "trade_row": trade_result,
+        "position_row": position_data,
+        "equity_row": equity_data,
+        "closed_symbol": closed_symbol,
+    }
+    response = _send("post", _URL_COMMIT_CYCLE, "commit trading cycle", data=_dump_json(payload))
+    if response is None:
+        return False
+    if response.status_code in (200, 201, 204):
+        invalidate_table("trades")
+        invalidate_table("equity")
+        logger.info("Trading cycle committed successfully")
+        return True
+    if not _function_missing(response):
+        # Rejected for a data or constraint reason (or timed out upstream): writing the rows one by
+        # one could leave a trade without its position/equity, so report the failure instead
+        logger.error("Failed to commit trading cycle: %s - %s", response.status_code, response.text)
+        return False
+
+    # Only a missing function falls back; nothing was written, so the rows can be sent one by one
+    logger.warning("commit_trade_cycle not deployed, writing cycle tables separately")
+    written = _update_trades(trade_result)
+    if position_data is not None:
+        written = _update_positions(position_data) and written
+    if closed_symbol is not None:
+        written = _close_position(closed_symbol) and written
+    return _update_equity(equity_data) and written
+
+def _validated_noop(validate: Callable[[Dict], bool], kind: str) -> Callable[[Dict], bool]:
+    """
+    Build a writer that validates like the real one but never touches the network.
+    """
+    def write(data: Dict) -> bool:
+        if not data or not validate(data):
+            logger.error("Invalid %s data", kind)
             return False
-    except Exception as e:
-        logger.error(f"Error storing signal: {e}")
-        return False 
+        return True
+    return write
+
+# Test mode is fixed at import, so pick the writers once instead of checking on every call
+update_trades = _validated_noop(validate_trade_data, "trade") if TEST_MODE else _update_trades
+update_positions = _validated_noop(validate_position_data, "position") if TEST_MODE else _update_positions
+update_equity = _validated_noop(validate_equity_data, "equity") if TEST_MODE else _update_equity
+update_signals = _validated_noop(validate_signal_data, "signal") if TEST_MODE else _update_signals
+commit_cycle = _valid_cycle if TEST_MODE else _commit_cycle
@@ -4,13 +4,14 @@ import argparse
 import sys
 import os
 from datetime import datetime
+from typing import Dict, Tuple
 
 from .services.fetcher import fetch_ohlcv
 from bot.strategy.signals import generate_signals
 from bot.risk.risk import calculate_position_size
 from .services.broker.paper import execute_trade
-from .db.supabase import update_trades, update_positions, update_equity, update_signals
-from .db.operations import DatabaseOperations
+from .db.supabase import commit_cycle, update_signals
+from .db.operations import DatabaseOperations, submit_write
 from .core.config import load_config
 from .utils.helpers import log_function_call, exponential_backoff, is_market_open, get_time_until_market_open
 from .utils.monitoring import monitor
@@ -18,6 +19,15 @@ from .db.init_db import init_database
 from .core.logging import setup_logging, get_logger
 from .core.server import run_api_server, run_combined_server, run_background_bot
 
+# Last (side, strength) stored per symbol, so repeated identical HOLD signals aren't re-written every cycle
+_last_signals: Dict[str, Tuple[str, float]] = {}
+
+def _store_signal(symbol: str, signal_key: Tuple[str, float], signal_data: Dict) -> bool:
+    """Write a signal, remembering it only once stored so a failed write is retried next cycle."""
+    stored = update_signals(signal_data)
+    if stored:
+        _last_signals[symbol] = signal_key
+    return stored
 
 def setup_application():
     """Initialize application components."""
@@ -39,6 +49,13 @@ def setup_application():
         sys.exit(1)
 
 
+def _merge_position(old_qty: float, old_avg: float, new_qty: float, new_px: float):
+    """Add a fill to a position; returns (total shares, weighted average price, unrealized P/L)."""
+    total_shares = old_qty + new_qty
+    new_avg_price = (old_qty * old_avg + new_qty * new_px) / total_shares
+    return total_shares, new_avg_price, (new_px - new_avg_price) * total_shares
+
+
 @log_function_call
 @exponential_backoff(max_retries=3, base_delay=1)
 def run_trading_cycle(symbol: str = "AAPL"):
@@ -59,21 +76,19 @@ def run_trading_cycle(symbol: str = "AAPL"):
             monitor.record_failure(error_msg)
             return
 
+        # Latest close as a plain float, reused for the signal record, sizing and cash checks
+        current_price = float(data['close'].iat[-1])
+
         # Get current equity and open positions from DB first (needed for signal generation)
         current_equity = float(settings["STARTING_EQUITY"])
 
-        # Fetch current positions from database
-        current_positions = db_ops.get_positions()
-        open_positions = len(current_positions)
+        # Fetch current positions from database, keyed by symbol (unique in the positions table)
+        positions_by_symbol = {pos.symbol: pos for pos in db_ops.get_positions()}
+        open_positions = len(positions_by_symbol)
         
         # Get current position for this symbol (if any)
-        existing_position = None
-        existing_position_qty = 0
-        for pos in current_positions:
-            if pos.symbol == symbol:
-                existing_position = pos
-                existing_position_qty = pos.quantity
-                break
+        existing_position = positions_by_symbol.get(symbol)
+        existing_position_qty = existing_position.quantity if existing_position else 0
         
         logger.info(f"Current positions: {open_positions}, Existing {symbol} position: {existing_position_qty}")
 
@@ -87,7 +102,6 @@ def run_trading_cycle(symbol: str = "AAPL"):
             return
 
         # Store signals to database
-        current_price = float(data['close'].iloc[-1]) if not data.empty else 100.0
         signal_data = {
             'symbol': symbol,
             'signal_type': signals.get('side', 'hold'),
@@ -101,10 +115,15 @@ def run_trading_cycle(symbol: str = "AAPL"):
         if signals.get('used_fallback'):
             logger.info("Used fallback strategy due to insufficient data")
         
-        update_signals(signal_data)
+        # Nothing in the cycle reads signals back, so the write doesn't hold up the trade.
+        # A HOLD identical to the last stored signal adds nothing to the history, so it is skipped.
+        signal_key = (signal_data['signal_type'], round(signal_data['strength'], 3))
+        if signal_key[0] == 'hold' and _last_signals.get(symbol) == signal_key:
+            logger.info("Signal unchanged since last cycle; skipping signal write")
+        else:
+            submit_write(_store_signal, symbol, signal_key, signal_data)
 
         # Calculate position size based on risk
-        current_price = data['close'].iloc[-1] if not data.empty else 100.0
         position_size_data = calculate_position_size(signals, current_equity, open_positions, current_price)
         if not position_size_data:
             logger.info(f"📊 Analysis for {symbol} complete: HOLD signal - no trade executed")
@@ -133,18 +152,19 @@ def run_trading_cycle(symbol: str = "AAPL"):
                 position_size = int(existing_position.quantity)
                 logger.info(f"Adjusted SELL size to {position_size} shares (max available)")
         
-        elif side == 'buy':
+        # Latest cash balance, used for the affordability check and the post-trade cash update;
+        # read after the SELL guard so a rejected sell doesn't pay for the round-trip
+        equity_history = db_ops.get_equity_history()
+        previous_cash = equity_history[-1].cash if equity_history else current_equity
+
+        if side == 'buy':
             # Check if we have enough cash for BUY trade
             required_cash = position_size * current_price
-            # Get latest equity info
-            equity_history = db_ops.get_equity_history()
-            if equity_history:
-                available_cash = equity_history[-1].cash
-                if available_cash < required_cash:
-                    logger.warning(f"Cannot BUY {position_size} shares: Need ${required_cash:.2f}, only have ${available_cash:.2f}")
-                    logger.info("Trading cycle completed successfully (insufficient funds prevented)")
-                    monitor.record_success()
-                    return
+            if equity_history and previous_cash < required_cash:
+                logger.warning(f"Cannot BUY {position_size} shares: Need ${required_cash:.2f}, only have ${previous_cash:.2f}")
+                logger.info("Trading cycle completed successfully (insufficient funds prevented)")
+                monitor.record_success()
+                return
         
         # Execute trade based on analysis
         logger.info(f"🎯 Executing trade for {symbol}: {side.upper()} {position_size} shares")
@@ -155,24 +175,28 @@ def run_trading_cycle(symbol: str = "AAPL"):
             monitor.record_failure(error_msg)
             return
 
-        # Update database with trade, positions, and equity
-        update_trades(trade_result)
+        # Work out the new position and equity locally; the trade, position and equity rows are
+        # then written together in one transaction. None means the position row is left as is,
+        # unless closed_symbol is set, in which case the row is deleted.
+        position_data = None
+        closed_symbol = None
         
         # UPDATE POSITIONS CORRECTLY BASED ON TRADE DIRECTION
         if side == 'buy':
             # BUY: Add to position (or create new position)
             if existing_position:
                 # Update existing position with weighted average price
-                total_shares = existing_position.quantity + trade_result['quantity']
-                total_value = (existing_position.quantity * existing_position.average_entry_price) + (trade_result['quantity'] * trade_result['price'])
-                new_avg_price = total_value / total_shares
+                total_shares, new_avg_price, unrealized_pnl = _merge_position(
+                    existing_position.quantity, existing_position.average_entry_price,
+                    trade_result['quantity'], trade_result['price']
+                )
                 
                 position_data = {
                     'symbol': trade_result['symbol'],
                     'quantity': total_shares,
                     'average_entry_price': new_avg_price,
                     'current_price': trade_result['price'],
-                    'unrealized_pnl': (trade_result['price'] - new_avg_price) * total_shares,
+                    'unrealized_pnl': unrealized_pnl,
                     'timestamp': trade_result['timestamp']
                 }
                 logger.info(f"Updating existing position: {total_shares} shares @ ${new_avg_price:.2f} avg")
@@ -188,8 +212,6 @@ def run_trading_cycle(symbol: str = "AAPL"):
                 }
                 logger.info(f"Creating new position: {trade_result['quantity']} shares @ ${trade_result['price']:.2f}")
             
-            update_positions(position_data)
-            
         elif side == 'sell':
             # SELL: Reduce position (or close completely)
             if existing_position:
@@ -205,28 +227,27 @@ def run_trading_cycle(symbol: str = "AAPL"):
                         'unrealized_pnl': (trade_result['price'] - existing_position.average_entry_price) * remaining_shares,
                         'timestamp': trade_result['timestamp']
                     }
-                    update_positions(position_data)
                     logger.info(f"Reduced position to {remaining_shares} shares @ ${existing_position.average_entry_price:.2f} avg")
                 else:
                     # Complete sale - remove position
-                    # TODO: Implement position deletion logic
+                    closed_symbol = symbol
                     logger.info(f"Position closed completely by selling {trade_result['quantity']} shares")
         
         # CALCULATE EQUITY CORRECTLY
-        # Get current cash from previous equity record
-        equity_history = db_ops.get_equity_history()
-        previous_cash = equity_history[-1].cash if equity_history else current_equity
-        
         # Calculate cash change based on trade
         if side == 'buy':
             new_cash = previous_cash - (trade_result['quantity'] * trade_result['price'])
         else:  # sell
             new_cash = previous_cash + (trade_result['quantity'] * trade_result['price'])
         
-        # Calculate total portfolio value
-        total_position_value = 0
-        for pos in db_ops.get_positions():
-            total_position_value += pos.quantity * pos.current_price
+        # Calculate total portfolio value from the positions read at the start of the cycle,
+        # with this symbol's entry replaced by the update (or dropped when fully sold)
+        position_values = {sym: pos.quantity * pos.current_price for sym, pos in positions_by_symbol.items()}
+        if position_data:
+            position_values[symbol] = position_data['quantity'] * position_data['current_price']
+        elif side == 'sell':
+            position_values.pop(symbol, None)
+        total_position_value = sum(position_values.values())
         
         total_portfolio_value = new_cash + total_position_value
 
@@ -235,7 +256,11 @@ def run_trading_cycle(symbol: str = "AAPL"):
             'cash': new_cash,
             'timestamp': trade_result['timestamp']
         }
-        update_equity(equity_data)
+        if not commit_cycle(trade_result, position_data, equity_data, closed_symbol=closed_symbol):
+            error_msg = f"Failed to record trade for {symbol} in the database"
+            logger.error(error_msg)
+            monitor.record_failure(error_msg)
+            return
 
         logger.info(f"Portfolio update: Cash=${new_cash:.2f}, Positions=${total_position_value:.2f}, Equity=${total_portfolio_value:.2f}")
 
@@ -248,23 +273,38 @@ def run_trading_cycle(symbol: str = "AAPL"):
         monitor.record_failure(error_msg)
 
 
-def main():
-    """Main entry point with support for different server modes."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once; environment-backed defaults are resolved in main() per call."""
     parser = argparse.ArgumentParser(description="Trading Bot - Unified Entry Point")
-    parser.add_argument('--mode', type=str, choices=['api', 'combined', 'bot'], 
-                       default='bot', help="Server mode: api (API only), combined (API+bot), bot (bot only)")
-    parser.add_argument('--symbols', type=str, default=os.environ.get("TRADING_SYMBOLS", "AAPL,MSFT,JNJ,UNH,V"), 
-                       help="Comma-separated ticker symbols to trade")
-    parser.add_argument('--interval', type=int, default=int(os.environ.get("TRADING_INTERVAL", "300")), 
-                       help="Trading cycle interval in seconds")
+    parser.add_argument('--mode', type=str, choices=['api', 'combined', 'bot'], default=None,
+                       help="Server mode: api (API only), combined (API+bot), bot (bot only); defaults to RUN_MODE")
+    parser.add_argument('--symbols', type=str, default=None,
+                       help="Comma-separated ticker symbols to trade; defaults to TRADING_SYMBOLS")
+    parser.add_argument('--interval', type=int, default=None,
+                       help="Trading cycle interval in seconds; defaults to TRADING_INTERVAL")
     parser.add_argument('--max-loops', type=int, default=None, help="Maximum number of cycles (for testing)")
     parser.add_argument('--host', type=str, default="0.0.0.0", help="Host to bind server to")
     parser.add_argument('--port', type=int, default=None, help="Port to bind server to")
     
     # For backward compatibility - if --loop is used, default to bot mode
     parser.add_argument('--loop', action='store_true', help="Run in bot mode (deprecated, use --mode bot)")
+    return parser
+
+
+_PARSER = _build_parser()
+
+
+def main():
+    """Main entry point with support for different server modes."""
+    args = _PARSER.parse_args()
     
-    args = parser.parse_args()
+    # Environment defaults are read at call time so the shared parser never goes stale
+    if args.mode is None:
+        args.mode = os.environ.get("RUN_MODE", "bot")
+    if args.symbols is None:
+        args.symbols = os.environ.get("TRADING_SYMBOLS", "AAPL,MSFT,JNJ,UNH,V")
+    if args.interval is None:
+        args.interval = int(os.environ.get("TRADING_INTERVAL", "300"))
     
     # Handle backward compatibility
     if args.loop and args.mode == 'bot':
@@ -285,9 +325,7 @@ def main():
     elif args.mode == 'combined':
         run_combined_server(args.host, args.port)
     elif args.mode == 'bot':
-        # For bot mode, use health port for health server
-        health_port = args.port if args.port != 8000 else 8080
-        run_background_bot(args.symbols, args.interval, args.max_loops, health_port)
+        run_background_bot(args.symbols, args.interval, args.max_loops)
     else:
         print(f"Unknown mode: {args.mode}")
         sys.exit(1)
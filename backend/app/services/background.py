@@ -2,15 +2,22 @@
 Background trading bot service.
 Extracted from combined_server.py to make it a reusable service.
 """
+import asyncio
 import os
-import time
 import signal
+import socket
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from typing import Optional, List
 
+from postgrest.exceptions import APIError
+
+from ..core.config import load_config
 from ..core.logging import get_logger
+from ..db.client import DatabaseClient
 from ..main import setup_application, run_trading_cycle
+from .fetcher import fetch_ohlcv
 from ..utils.helpers import is_market_open, get_time_until_market_open
 
 
@@ -24,91 +31,124 @@ bot_status = {
     'next_cycle_time': None
 }
 
-# Global flag for graceful shutdown
-shutdown_flag = False
+# Set by the signal handler; the standalone loop waits on it instead of polling
+shutdown_event = threading.Event()
+
+# Identifies this process in the bot_lease row
+BOT_LEASE_HOLDER = f"{socket.gethostname()}:{os.getpid()}"
 
 
 class BackgroundBot:
-    """Background trading bot that runs in a separate thread."""
+    """Background trading bot that runs as an asyncio task on the server's event loop."""
     
     def __init__(self, interval_seconds: int = 300, symbols: Optional[List[str]] = None):
         self.interval_seconds = interval_seconds
-        self.running = False
-        self.thread = None
+        self.task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._last_market_open: Optional[bool] = None
         self.symbols = symbols or ["AAPL", "MSFT", "JNJ", "UNH", "V"]
         self.logger = get_logger(__name__)
+    
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
         
     def start(self):
-        """Start the background bot in a separate thread."""
+        """Schedule the bot loop on the running event loop (call from an async startup hook)."""
         if self.running:
             self.logger.warning("Bot is already running")
             return
             
-        self.logger.info(f"Starting background bot with {self.interval_seconds}s interval")
-        self.running = True
-        self.thread = threading.Thread(target=self._run_loop, daemon=True)
-        self.thread.start()
-        self.logger.info("Background bot thread started")
+        self.logger.info("Starting background bot with %ds interval", self.interval_seconds)
+        self._stop_event = asyncio.Event()
+        self._last_market_open = None
+        self.task = asyncio.get_running_loop().create_task(self._run_loop())
+        self.logger.info("Background bot task started")
         
-    def stop(self):
-        """Stop the background bot."""
+    async def stop(self):
+        """Stop the background bot, letting an in-flight trading cycle finish."""
         self.logger.info("Stopping background bot")
-        self.running = False
-        if self.thread:
-            self.thread.join(timeout=30)
+        if self._stop_event:
+            self._stop_event.set()
+        if self.task:
+            try:
+                await asyncio.wait_for(self.task, timeout=30)
+            except asyncio.TimeoutError:
+                self.logger.warning("Background bot did not stop within 30s; cancelled")
+    
+    async def _sleep(self, seconds: float):
+        """Wait up to `seconds`, waking immediately if stop() is called."""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+            
+    async def _prefetch_market_data(self):
+        """Fetch OHLCV for every symbol concurrently so the serial cycles below hit the fetcher cache."""
+        results = await asyncio.gather(
+            *(asyncio.to_thread(fetch_ohlcv, symbol) for symbol in self.symbols),
+            return_exceptions=True
+        )
+        for symbol, result in zip(self.symbols, results):
+            if isinstance(result, Exception):
+                self.logger.warning("Prefetch failed for %s: %s", symbol, result)
             
-    def _run_loop(self):
-        """Main bot loop that runs in the background thread."""
+    async def _run_loop(self):
+        """Main bot loop; blocking work runs in worker threads so requests keep being served."""
         self.logger.info("=== BACKGROUND BOT LOOP STARTED ===")
         
         # Initialize the application once
         try:
             self.logger.info("Setting up bot application...")
-            setup_application()
+            await asyncio.to_thread(setup_application)
             self.logger.info("Bot application setup completed")
-        except Exception as e:
-            self.logger.error(f"Bot setup failed: {e}", exc_info=True)
+        except Exception:
+            self.logger.error("Bot setup failed", exc_info=True)
             return
             
         # Main trading loop
-        while self.running:
+        while not self._stop_event.is_set():
             try:
-                # Check if market is open
-                if not is_market_open():
+                # Check if market is open (once per iteration)
+                market_open = is_market_open()
+                bot_status['market_open'] = market_open
+                # Market state is only logged on open/closed transitions, not every iteration
+                state_changed = market_open != self._last_market_open
+                self._last_market_open = market_open
+                if not market_open:
                     time_until_open = get_time_until_market_open()
-                    hours_until_open = time_until_open // 3600
-                    minutes_until_open = (time_until_open % 3600) // 60
-                    
-                    self.logger.info(f"Market is closed. Next open in {hours_until_open}h {minutes_until_open}m")
-                    
                     # Sleep for 30 minutes when market is closed (to avoid frequent checks)
                     sleep_time = min(1800, time_until_open)  # 30 minutes or time until open, whichever is shorter
-                    self.logger.info(f"Sleeping for {sleep_time // 60} minutes while market is closed")
                     
-                    # Sleep with interruption check
-                    for _ in range(sleep_time):
-                        if not self.running:
-                            break
-                        time.sleep(1)
+                    if state_changed:
+                        hours_until_open, remainder = divmod(time_until_open, 3600)
+                        self.logger.info(
+                            "Market is closed. Next open in %dh %dm, rechecking every %d minutes",
+                            hours_until_open, remainder // 60, sleep_time // 60,
+                            extra={'market_open': False, 'seconds_until_open': time_until_open, 'sleep_seconds': sleep_time}
+                        )
+                    await self._sleep(sleep_time)
                     continue
                 
                 # Market is open - run trading cycle
-                if is_market_open():
-                    self.logger.info("Market is open - running trading cycle for all symbols...")
-                    for symbol in self.symbols:
-                        self.logger.info(f"Running trading cycle for {symbol}")
-                        run_trading_cycle(symbol)
-                    self.logger.info(f"Trading cycles completed, sleeping for {self.interval_seconds}s")
+                if state_changed:
+                    self.logger.info("Market is open", extra={'market_open': True})
+                # Same single-trader lease as the standalone loop, so combined mode never trades beside a bot replica
+                if not await asyncio.to_thread(_acquire_bot_lease, self.interval_seconds * 3, self.logger):
+                    self.logger.info("Another bot instance holds the trading lease - standing by")
+                    await self._sleep(self.interval_seconds)
+                    continue
+                await self._prefetch_market_data()
+                self.logger.info("Running trading cycles for %s", self.symbols)
+                for symbol in self.symbols:
+                    await asyncio.to_thread(run_trading_cycle, symbol)
+                self.logger.info("Trading cycles completed, sleeping for %ds", self.interval_seconds)
                 
-                # Sleep with interruption check
-                for _ in range(self.interval_seconds):
-                    if not self.running:
-                        break
-                    time.sleep(1)
+                await self._sleep(self.interval_seconds)
                     
-            except Exception as e:
-                self.logger.error(f"Error in bot loop: {e}", exc_info=True)
-                time.sleep(60)  # Wait 1 minute before retrying on error
+            except Exception:
+                self.logger.error("Error in bot loop", exc_info=True)
+                await self._sleep(60)  # Wait 1 minute before retrying on error
 
 
 # Global bot instance
@@ -117,16 +157,49 @@ background_bot = BackgroundBot()
 
 def signal_handler(signum, _frame):
     """Handle shutdown signals from deployment platforms."""
-    global shutdown_flag, background_bot
     logger = get_logger(__name__)
-    logger.info(f"🛑 Received signal {signum} - initiating graceful shutdown")
+    logger.info("🛑 Received signal %s - initiating graceful shutdown", signum)
     
-    # Update status for health checks
+    # Update status for health checks and wake the standalone loop
     bot_status['status'] = 'shutting_down'
-    shutdown_flag = True
-    
-    # Stop background bot
-    background_bot.stop()
+    shutdown_event.set()
+
+
+def reload_handler(signum, _frame):
+    """Drop the cached config so the next trading cycle re-reads the environment."""
+    get_logger(__name__).info("🔄 Received signal %s - reloading configuration", signum)
+    load_config.cache_clear()
+
+
+def _prefetch_market_data(pool: ThreadPoolExecutor, symbols: List[str], logger) -> None:
+    """Fetch OHLCV for all symbols in parallel so the serial trading cycles hit the fetcher cache."""
+    futures = {symbol: pool.submit(fetch_ohlcv, symbol) for symbol in symbols}
+    for symbol, future in futures.items():
+        try:
+            future.result()
+        except Exception as e:
+            logger.warning("Prefetch failed for %s: %s", symbol, e)
+
+
+def _rpc_missing(error: Exception) -> bool:
+    """True when PostgREST reports that the called function isn't deployed (PGRST202 / 404)."""
+    return isinstance(error, APIError) and str(error.code) in ("PGRST202", "404")
+
+
+def _acquire_bot_lease(ttl_seconds: int, logger) -> bool:
+    """Claim or renew the single-bot lease; True when this process may trade."""
+    try:
+        result = DatabaseClient.get_instance().rpc(
+            'acquire_bot_lease', {'holder_id': BOT_LEASE_HOLDER, 'ttl_seconds': ttl_seconds}
+        ).execute()
+    except Exception as e:
+        if _rpc_missing(e):
+            logger.warning("acquire_bot_lease is not deployed, running without leader election")
+            return True
+        # A transient failure must not let a standby trade beside the leader; retry next interval
+        logger.warning("Could not confirm the trading lease, standing by: %s", e)
+        return False
+    return result.data is True
 
 
 def run_background_bot_loop(symbols: str = "AAPL,MSFT,JNJ,UNH,V",
@@ -145,6 +218,8 @@ def run_background_bot_loop(symbols: str = "AAPL,MSFT,JNJ,UNH,V",
     # Register signal handlers for graceful shutdown
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, reload_handler)
     
     # Setup application
     setup_application()
@@ -157,37 +232,43 @@ def run_background_bot_loop(symbols: str = "AAPL,MSFT,JNJ,UNH,V",
     
     logger.info("=" * 60)
     logger.info("🚀 TRADING BOT BACKGROUND WORKER STARTING")
-    logger.info(f"📊 Symbols: {symbols}")
+    logger.info("📊 Symbols: %s", symbols)
     
     symbol_list = [s.strip().upper() for s in symbols.split(',') if s.strip()]
     
-    while not shutdown_flag:
+    # Reused across cycles; cycles themselves stay serial since each sizes trades from shared cash/positions
+    prefetch_pool = ThreadPoolExecutor(max_workers=max(1, len(symbol_list)), thread_name_prefix="prefetch")
+    
+    while not shutdown_event.is_set():
         try:
             current_time = datetime.now(timezone.utc)
         
             # Check if market is open
             market_open = is_market_open()
             bot_status['market_open'] = market_open
-            logger.info(f"🏪 Market status: {'OPEN' if market_open else 'CLOSED'} at {current_time.strftime('%H:%M:%S UTC')}")
+            logger.info("🏪 Market status: %s at %s", 'OPEN' if market_open else 'CLOSED', current_time.strftime('%H:%M:%S UTC'))
             
             if not market_open:
                 time_until_open = get_time_until_market_open()
-                hours_until_open = time_until_open // 3600
-                minutes_until_open = (time_until_open % 3600) // 60
+                hours_until_open, remainder = divmod(time_until_open, 3600)
+                minutes_until_open = remainder // 60
                 
-                logger.info(f"🕐 Market closed - Next open in {hours_until_open}h {minutes_until_open}m")
+                logger.info("🕐 Market closed - Next open in %dh %dm", hours_until_open, minutes_until_open)
                 
                 # Sleep for 30 minutes when market is closed (to avoid frequent checks)
                 sleep_time = min(1800, time_until_open)  # 30 minutes or time until open
                 sleep_minutes = sleep_time // 60
                 
-                logger.info(f"😴 Sleeping for {sleep_minutes} minutes while market is closed")
+                logger.info("😴 Sleeping for %d minutes while market is closed", sleep_minutes)
                 
                 # Interruptible sleep for market closed period
-                for _ in range(sleep_time):
-                    if shutdown_flag:
-                        break
-                    time.sleep(1)
+                shutdown_event.wait(sleep_time)
+                continue
+            
+            # Market is open - only the replica holding the lease trades; it expires if that replica dies
+            if not _acquire_bot_lease(interval * 3, logger):
+                logger.info("⏸️  Another bot instance (not %s) holds the trading lease - standing by", BOT_LEASE_HOLDER)
+                shutdown_event.wait(interval)
                 continue
             
             # Market is open - run trading cycle
@@ -195,17 +276,18 @@ def run_background_bot_loop(symbols: str = "AAPL,MSFT,JNJ,UNH,V",
             bot_status['cycles_completed'] = cycle_count
             
             logger.info("=" * 40)
-            logger.info(f"📈 TRADING CYCLE #{cycle_count} STARTING")
-            logger.info(f"📊 Symbols: {symbols}")
-            logger.info(f"🕐 Time: {current_time.strftime('%H:%M:%S UTC')}")
+            logger.info("📈 TRADING CYCLE #%d STARTING", cycle_count)
+            logger.info("📊 Symbols: %s", symbols)
+            logger.info("🕐 Time: %s", current_time.strftime('%H:%M:%S UTC'))
             logger.info("=" * 40)
             
+            _prefetch_market_data(prefetch_pool, symbol_list, logger)
             for symbol in symbol_list:
-                logger.info(f"📈 Running trading cycle #{cycle_count} for {symbol}")
+                logger.info("📈 Running trading cycle #%d for %s", cycle_count, symbol)
                 run_trading_cycle(symbol)
             
             bot_status['last_cycle_time'] = current_time
-            logger.info(f"✅ Trading cycle #{cycle_count} completed")
+            logger.info("✅ Trading cycle #%d completed", cycle_count)
             
             # Log next cycle info
             next_cycle_time = current_time.timestamp() + interval
@@ -213,33 +295,32 @@ def run_background_bot_loop(symbols: str = "AAPL,MSFT,JNJ,UNH,V",
             next_cycle_str = next_cycle_datetime.strftime('%H:%M:%S UTC')
             bot_status['next_cycle_time'] = next_cycle_datetime
             
-            logger.info(f"⏳ Next cycle #{cycle_count + 1} at {next_cycle_str}")
-            logger.info(f"😴 Sleeping for {interval}s ({interval//60} minutes)")
+            logger.info("⏳ Next cycle #%d at %s", cycle_count + 1, next_cycle_str)
+            logger.info("😴 Sleeping for %ds (%d minutes)", interval, interval // 60)
             
             if max_loops is not None and cycle_count >= max_loops:
-                logger.info(f"🏁 Reached max loops limit: {max_loops}")
+                logger.info("🏁 Reached max loops limit: %d", max_loops)
                 break
             
             # Interruptible sleep for trading interval
-            for _ in range(interval):
-                if shutdown_flag:
-                    break
-                time.sleep(1)
+            shutdown_event.wait(interval)
             
         except KeyboardInterrupt:
             logger.info("⌨️  Keyboard interrupt received - shutting down bot")
             break
-        except Exception as e:
-            logger.error(f"❌ Error in bot loop: {e}", exc_info=True)
+        except Exception:
+            logger.error("❌ Error in bot loop", exc_info=True)
             
             # Wait 1 minute before retrying on error
             logger.info("⏳ Waiting 60 seconds before retry...")
-            time.sleep(60)
+            shutdown_event.wait(60)
         
+    prefetch_pool.shutdown(wait=False, cancel_futures=True)
+    
     # Log final stats
     runtime = datetime.now(timezone.utc) - start_time
     logger.info("=" * 60)
     logger.info("🏁 TRADING BOT BACKGROUND WORKER SHUTDOWN")
-    logger.info(f"📈 Total runtime: {runtime}")
-    logger.info(f"🔄 Total cycles completed: {cycle_count}")
+    logger.info("📈 Total runtime: %s", runtime)
+    logger.info("🔄 Total cycles completed: %d", cycle_count)
     logger.info("=" * 60)
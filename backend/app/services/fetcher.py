@@ -1,6 +1,7 @@
 import os
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import pandas as pd
 from typing import Optional
@@ -18,6 +19,11 @@ logger = logging.getLogger(__name__)
 TIINGO_BASE_URL = "https://api.tiingo.com/tiingo/daily"
 ALPHA_VANTAGE_BASE_URL = "https://www.alphavantage.co/query"
 
+# Keep-alive pool shared across cycles so each fetch skips the TCP/TLS handshake.
+# Retries stay with tenacity below, so the adapter doesn't add its own.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
 # Enhanced in-memory cache with fallback support
 cache = {}
 fallback_cache = {}  # Long-term cache for emergency fallback
@@ -84,7 +90,7 @@ def _fetch_tiingo(symbol, api_key):
     end_date = datetime.now().strftime('%Y-%m-%d')
     start_date = (datetime.now() - timedelta(days=120)).strftime('%Y-%m-%d')
     
-    response = requests.get(
+    response = _session.get(
         f"{TIINGO_BASE_URL}/{symbol}/prices",
         params={
             "token": api_key, 
@@ -118,7 +124,7 @@ def _fetch_tiingo(symbol, api_key):
 
 def _fetch_alpha_vantage_with_key(symbol, api_key):
     """Fetch data from Alpha Vantage with a single key."""
-    response = requests.get(
+    response = _session.get(
         ALPHA_VANTAGE_BASE_URL,
         params={
             "function": "TIME_SERIES_DAILY", 
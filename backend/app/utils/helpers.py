@@ -1,6 +1,7 @@
 import logging
 import time
 import functools
+import threading
 from logging.handlers import RotatingFileHandler
 import os
 from datetime import datetime, time as dt_time
@@ -29,55 +30,55 @@ file_handler.setFormatter(file_formatter)
 logger.addHandler(file_handler)
 
 def log_function_call(func):
+    name = func.__name__
+    # Per-thread marker so nested calls log once and concurrent cycles don't race on a shared flag
+    state = threading.local()
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        # Check if we're already inside a logged call to prevent duplicates
-        call_stack_key = f"_logging_{func.__name__}"
-        if hasattr(wrapper, call_stack_key):
+        if getattr(state, "active", False):
             # Already logging this function, just call it
             return func(*args, **kwargs)
-        
-        # Mark that we're logging this function
-        setattr(wrapper, call_stack_key, True)
-        logger.info(f"Entering {func.__name__} with args: {args}, kwargs: {kwargs}")
-        
+
+        state.active = True
+        logger.info("Entering %s with args: %s, kwargs: %s", name, args, kwargs)
         try:
             result = func(*args, **kwargs)
-            logger.info(f"Exiting {func.__name__} with result: {result}")
-            return result
         except Exception as e:
-            logger.error(f"Error in {func.__name__}: {e}", exc_info=True)
+            logger.error("Error in %s: %s", name, e, exc_info=True)
             raise
         finally:
-            # Clean up the marker
-            if hasattr(wrapper, call_stack_key):
-                delattr(wrapper, call_stack_key)
+            state.active = False
+        logger.info("Exiting %s with result: %s", name, result)
+        return result
     return wrapper
 
 def exponential_backoff(max_retries=3, base_delay=1):
     """
     Decorator for exponential backoff on function calls.
     """
+    # Delays are fixed per decoration, so compute them once rather than on every failure
+    delays = tuple(base_delay * (2 ** attempt) for attempt in range(max_retries))
+
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            retries = 0
-            while retries <= max_retries:
+            for delay in delays:
                 try:
                     return func(*args, **kwargs)
-                except Exception as e:
-                    retries += 1
-                    if retries > max_retries:
-                        logger.error(f"Max retries reached: {e}")
-                        raise
-                    delay = base_delay * (2 ** (retries - 1))
-                    logger.warning(f"Retrying in {delay} seconds...")
+                except Exception:
+                    logger.warning("Retrying in %s seconds...", delay)
                     time.sleep(delay)
-            # This line should never be reached, but ensures the loop exits
-            raise Exception("Unexpected exit from retry loop")
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger.error("Max retries reached: %s", e)
+                raise
         return wrapper
     return decorator
 
+MARKET_TZ = ZoneInfo("America/New_York")
+
 def is_market_open() -> bool:
     """
     Check if the US stock market is currently open.
@@ -88,10 +89,14 @@ def is_market_open() -> bool:
     Returns:
         bool: True if market is open, False otherwise
     """
+    # Market state can't flip within a second, so callers share one result per wall-clock second
+    return _is_market_open_at(int(time.time()))
+
+@functools.lru_cache(maxsize=2)
+def _is_market_open_at(second: int) -> bool:
+    """Market-hours check for the given Unix second."""
     try:
-        # Get current time in Eastern timezone
-        et_tz = ZoneInfo("America/New_York")
-        now = datetime.now(et_tz)
+        now = datetime.fromtimestamp(second, MARKET_TZ)
         
         # Check if it's a weekend
         if now.weekday() >= 5:  # Saturday = 5, Sunday = 6
@@ -122,12 +127,16 @@ def get_time_until_market_open() -> int:
     Returns:
         int: Seconds until market opens, or 0 if market is currently open
     """
+    return _time_until_market_open_at(int(time.time()))
+
+@functools.lru_cache(maxsize=2)
+def _time_until_market_open_at(second: int) -> int:
+    """Seconds from the given Unix second until the next market open."""
     try:
-        et_tz = ZoneInfo("America/New_York")
-        now = datetime.now(et_tz)
+        now = datetime.fromtimestamp(second, MARKET_TZ)
         
         # If market is currently open, return 0
-        if is_market_open():
+        if _is_market_open_at(second):
             return 0
         
         # Calculate next market open time
@@ -0,0 +1,76 @@
+"""
+Token-bucket rate limiting exposed as FastAPI dependencies.
+Each client costs two floats (tokens, last refill) and every check is O(1).
+State is per process; see api/limiter.py for which routes use this versus the slowapi limiter.
+"""
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+
+class TokenBucket:
+    """Per-client token bucket usable as `Depends(bucket)`."""
+
+    def __init__(self, rate: float, capacity: int, idle_ttl: float = 300.0):
+        """
+        Args:
+            rate: Tokens refilled per second
+            capacity: Maximum burst size
+            idle_ttl: Seconds a full bucket may sit idle before it is dropped
+        """
+        self.rate = rate
+        self.capacity = float(capacity)
+        self.idle_ttl = idle_ttl
+        self.buckets: Dict[str, Tuple[float, float]] = {}
+        self._last_sweep = time.monotonic()
+
+    def consume(self, key: str, now: Optional[float] = None) -> bool:
+        """Take one token for `key`, returning False when the bucket is empty."""
+        now = time.monotonic() if now is None else now
+        tokens, last = self.buckets.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - last) * self.rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self.buckets[key] = (tokens, now)
+
+        if now - self._last_sweep >= self.idle_ttl:
+            self._sweep(now)
+        return allowed
+
+    def retry_after(self, key: str) -> int:
+        """Seconds until `key` has a full token again."""
+        tokens, _ = self.buckets.get(key, (self.capacity, 0.0))
+        return max(1, math.ceil((1 - tokens) / self.rate))
+
+    def reset(self) -> None:
+        """Forget all client state."""
+        self.buckets.clear()
+        self._last_sweep = time.monotonic()
+
+    def _sweep(self, now: float) -> None:
+        """Drop idle clients whose bucket would already be full, bounding memory."""
+        stale = [
+            key for key, (tokens, last) in self.buckets.items()
+            if now - last >= self.idle_ttl and tokens + (now - last) * self.rate >= self.capacity
+        ]
+        for key in stale:
+            del self.buckets[key]
+        self._last_sweep = now
+
+    async def __call__(self, request: Request) -> None:
+        # Runs on the event loop, so bucket updates need no lock
+        client = request.client.host if request.client else "unknown"
+        if not self.consume(client):
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": str(self.retry_after(client))}
+            )
+
+
+# Shared across routers: 30 requests/minute with bursts up to 30
+api_rate_limit = TokenBucket(rate=0.5, capacity=30)
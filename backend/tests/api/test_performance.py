@@ -102,6 +102,32 @@ def test_get_performance_fallback_recent_records(client, mock_supabase, valid_ap
     assert len(data["equity_curve"]) == 5
     assert data["benchmark_curve"]
 
+def test_get_performance_metrics_only(client, mock_supabase, valid_api_key):
+    """Metrics-only requests fetch just the first and last equity rows."""
+    equity_data = _build_equity_series(30)
+
+    query_mock = mock_supabase.return_value.table.return_value
+    query_mock.execute.side_effect = [
+        MagicMock(data=[equity_data[0]]),
+        MagicMock(data=[equity_data[-1]])
+    ]
+
+    try:
+        with patch('backend.app.api.endpoints.performance.fetch_ohlcv') as mock_fetch:
+            response = client.get("/api/performance?include_curve=false", headers={"X-API-Key": valid_api_key})
+    finally:
+        query_mock.execute.side_effect = None
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["equity_curve"] == []
+    assert data["benchmark_curve"] == []
+    assert data["metrics"]["initial_equity"] == pytest.approx(100000.0)
+    assert data["metrics"]["final_equity"] == pytest.approx(100000.0 + 29 * 500)
+    assert query_mock.execute.call_count == 2
+    mock_fetch.assert_not_called()
+
+
 def test_get_performance_invalid_date_range(client, valid_api_key):
     """Test performance data retrieval with invalid date range."""
     # Test with invalid days parameter
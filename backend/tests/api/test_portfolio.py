@@ -33,6 +33,33 @@ def test_get_portfolio_success(client, mock_supabase, sample_portfolio_data, val
     assert len(data["positions"]) == 1
     assert data["positions"][0]["symbol"] == "AAPL"
 
+def test_get_portfolio_uses_summary_rpc(client, mock_supabase, valid_api_key):
+    """Server-side portfolio summary should be returned as-is when the RPC is available."""
+    summary = {
+        "positions": [{
+            "symbol": "AAPL",
+            "quantity": 10.0,
+            "avg_price": 102.0,
+            "current_price": 105.0,
+            "market_value": 1050.0,
+            "unrealized_pl": 30.0,
+            "timestamp": datetime.now().isoformat()
+        }],
+        "total_pl": 30.0
+    }
+    mock_supabase.return_value.rpc.return_value.execute.return_value.data = summary
+
+    equity_chain = mock_supabase.return_value.table.return_value.select.return_value.order.return_value.limit
+    equity_chain.return_value.execute.return_value.data = [{"equity": 101000.0, "timestamp": None}]
+
+    response = client.get("/api/portfolio", headers={"X-API-Key": valid_api_key})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["positions"][0]["market_value"] == 1050.0
+    assert data["total_pl"] == 30.0
+    mock_supabase.return_value.rpc.assert_called_with("get_portfolio_summary", {})
+
 def test_get_portfolio_no_data(client, mock_supabase, valid_api_key):
     """Test portfolio retrieval with no data."""
     # Mock empty responses
@@ -24,6 +24,59 @@ def test_get_status_success(client, mock_supabase, valid_api_key):
     assert "disclaimer" in data
 
 
+def test_get_status_served_from_cache(client, mock_supabase, valid_api_key):
+    """Repeated status requests within the TTL should not query Supabase again."""
+    latest_equity_response = MagicMock()
+    latest_equity_response.data = [{"timestamp": datetime.now(timezone.utc).isoformat()}]
+
+    table_mock = mock_supabase.return_value.table.return_value
+    table_mock.select.return_value.order.return_value.limit.return_value.execute.return_value = latest_equity_response
+
+    first = client.get("/api/status", headers={"X-API-Key": valid_api_key})
+    calls_after_first = mock_supabase.return_value.table.call_count
+    second = client.get("/api/status", headers={"X-API-Key": valid_api_key})
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    # The cached snapshot is reused; only the response-time clock moves
+    first_body, second_body = first.json(), second.json()
+    assert second_body.pop("system_time") >= first_body.pop("system_time")
+    assert second_body == first_body
+    assert mock_supabase.return_value.table.call_count == calls_after_first
+
+
+def test_get_status_not_modified(client, mock_supabase, valid_api_key):
+    """A matching If-None-Match should produce an empty 304."""
+    latest_equity_response = MagicMock()
+    latest_equity_response.data = [{"timestamp": datetime.now(timezone.utc).isoformat()}]
+
+    table_mock = mock_supabase.return_value.table.return_value
+    table_mock.select.return_value.order.return_value.limit.return_value.execute.return_value = latest_equity_response
+
+    first = client.get("/api/status", headers={"X-API-Key": valid_api_key})
+    etag = first.headers["ETag"]
+    second = client.get("/api/status", headers={"X-API-Key": valid_api_key, "If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+    assert second.content == b""
+
+
+def test_status_etag_tracks_data_delay():
+    """A growing delay with an unchanged last_update must not revalidate as 304."""
+    from backend.app.api.endpoints.status import status_response
+
+    request = MagicMock()
+    request.headers = {}
+    base = {"status": {"database": "healthy", "api": "healthy"}, "last_update": "2024-01-01T00:00:00+00:00"}
+    fresh = status_response(request, {**base, "data_delay_minutes": 5}, False, "no-cache")
+    stale = status_response(request, {**base, "data_delay_minutes": 30}, False, "no-cache")
+
+    assert fresh.headers["ETag"] != stale.headers["ETag"]
+
+
 def test_get_status_database_unhealthy(client, mock_supabase, valid_api_key):
     """Database check failures should mark the database as unhealthy."""
     execute_mock = MagicMock()
@@ -39,13 +39,116 @@ def test_get_trades_with_filters(client, mock_supabase, sample_trades_data, vali
     assert len(data["trades"]) == 1
 
 
+def test_get_trades_uses_exact_count(client, mock_supabase, sample_trades_data, valid_api_key):
+    """Total count comes from the data query's exact count, without a separate ID scan."""
+    table = mock_supabase.return_value.table.return_value
+    page_response = table.select.return_value.order.return_value.range.return_value.execute.return_value
+    page_response.data = sample_trades_data
+    page_response.count = 45
+
+    response = client.get("/api/trades?page=1&page_size=20&include_count=true", headers={"X-API-Key": valid_api_key})
+
+    assert response.status_code == 200
+    pagination = response.json()["pagination"]
+    assert pagination["total_count"] == 45
+    assert pagination["total_pages"] == 3
+    table.select.assert_called_once_with("*", count="exact")
+
+
+def test_get_trades_count_is_opt_in(client, mock_supabase, sample_trades_data, valid_api_key):
+    """Without include_count the endpoint skips the exact count and omits totals."""
+    table = mock_supabase.return_value.table.return_value
+    table.select.return_value.order.return_value.range.return_value.execute.return_value.data = sample_trades_data
+
+    response = client.get("/api/trades", headers={"X-API-Key": valid_api_key})
+
+    assert response.status_code == 200
+    pagination = response.json()["pagination"]
+    assert pagination["total_count"] is None
+    assert pagination["total_pages"] is None
+    table.select.assert_called_once_with("*")
+
+
+def test_get_trades_keyset_cursor(client, mock_supabase, sample_trades_data, valid_api_key):
+    """The before cursor filters on timestamp instead of using an offset range."""
+    table = mock_supabase.return_value.table.return_value
+    ordered = table.select.return_value.order.return_value
+    ordered.lt.return_value.limit.return_value.execute.return_value.data = sample_trades_data
+
+    cursor = "2024-01-01T00:00:00+00:00"
+    response = client.get(
+        "/api/trades",
+        params={"before": cursor, "page_size": 1},
+        headers={"X-API-Key": valid_api_key}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["trades"]) == 1
+    assert data["pagination"]["next_cursor"] == {
+        "before": sample_trades_data[-1]["timestamp"],
+        "before_id": sample_trades_data[-1]["id"],
+    }
+    ordered.lt.assert_called_once_with("timestamp", cursor)
+    ordered.range.assert_not_called()
+
+
+def test_get_trades_keyset_cursor_breaks_ties_by_id(client, mock_supabase, sample_trades_data, valid_api_key):
+    """With before_id, trades sharing the boundary timestamp are kept via an id tiebreak."""
+    table = mock_supabase.return_value.table.return_value
+    ordered = table.select.return_value.order.return_value
+    ordered.limit.return_value.execute.return_value.data = sample_trades_data
+    params = ordered.params
+
+    response = client.get(
+        "/api/trades",
+        params={"before": "2024-01-01T00:00:00+00:00", "before_id": 7},
+        headers={"X-API-Key": valid_api_key}
+    )
+
+    assert response.status_code == 200
+    table.select.return_value.order.assert_called_once_with("timestamp.desc,id", desc=True)
+    params.add.assert_called_once_with(
+        "or",
+        '(timestamp.lt."2024-01-01T00:00:00+00:00",and(timestamp.eq."2024-01-01T00:00:00+00:00",id.lt.7))'
+    )
+    ordered.lt.assert_not_called()
+
+
+def test_get_trades_rejects_malformed_cursor(client, mock_supabase, valid_api_key):
+    """A cursor that isn't a timestamp is a client error, not a database error."""
+    response = client.get(
+        "/api/trades",
+        params={"before": "not-a-timestamp"},
+        headers={"X-API-Key": valid_api_key}
+    )
+
+    assert response.status_code == 422
+    mock_supabase.return_value.table.assert_not_called()
+
+
+def test_get_trades_not_modified(client, mock_supabase, sample_trades_data, valid_api_key):
+    """Unchanged pages are answered with 304 when the client sends the ETag back."""
+    table = mock_supabase.return_value.table.return_value
+    page_response = table.select.return_value.order.return_value.range.return_value.execute.return_value
+    page_response.data = sample_trades_data
+    page_response.count = 1
+
+    first = client.get("/api/trades", headers={"X-API-Key": valid_api_key})
+    etag = first.headers["ETag"]
+    second = client.get("/api/trades", headers={"X-API-Key": valid_api_key, "If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+
+
 def test_get_trades_no_data(client, mock_supabase, valid_api_key):
     """Test trades retrieval with no data."""
     table = mock_supabase.return_value.table.return_value
     table.select.return_value.execute.return_value.data = []
     table.select.return_value.order.return_value.range.return_value.execute.return_value.data = []
 
-    response = client.get("/api/trades", headers={"X-API-Key": valid_api_key})
+    response = client.get("/api/trades?include_count=true", headers={"X-API-Key": valid_api_key})
 
     assert response.status_code == 200
     data = response.json()
@@ -9,6 +9,12 @@ from dotenv import load_dotenv
 from fastapi.testclient import TestClient
 
 import backend.app.services.fetcher as fetcher
+import backend.app.main as app_main
+from backend.app.core.config import load_config
+import backend.app.api.endpoints.performance as performance_endpoint
+import backend.app.api.endpoints.status as status_endpoint
+from backend.app.db.operations import clear_read_cache
+from backend.app.utils.ratelimit import api_rate_limit
 
 # Load .env file from project root
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '../../.env'))
@@ -46,9 +52,12 @@ def setup_test_env():
     for key, value in env_vars.items():
         original_env[key] = os.environ.get(key)
         os.environ[key] = value
+    load_config.cache_clear()
     
     yield
     
+    load_config.cache_clear()
+    
     # Restore original environment
     for key in env_vars:
         if key in original_env and original_env[key] is not None:
@@ -65,11 +74,27 @@ def clear_fetcher_cache():
     fetcher.cache.clear()
     fetcher.fallback_cache.clear()
 
+@pytest.fixture(autouse=True)
+def clear_endpoint_caches():
+    """Ensure endpoint response caches and rate-limit buckets do not leak between tests."""
+    api_rate_limit.reset()
+    performance_endpoint.equity_cache.clear()
+    performance_endpoint.benchmark_cache.clear()
+    status_endpoint.status_cache.update(value=None, expires=0.0)
+    clear_read_cache()
+    app_main._last_signals.clear()
+    yield
+    performance_endpoint.equity_cache.clear()
+    performance_endpoint.benchmark_cache.clear()
+    status_endpoint.status_cache.update(value=None, expires=0.0)
+    clear_read_cache()
+    app_main._last_signals.clear()
+
 @pytest.fixture
 def mock_requests():
     """Mock requests for all external API calls."""
-    with patch('backend.app.services.fetcher.requests.get') as mock_get, \
-         patch('backend.app.services.fetcher.requests.post') as mock_post:
+    with patch('backend.app.services.fetcher._session.get') as mock_get, \
+         patch('backend.app.services.fetcher._session.post') as mock_post:
         
         # Mock Tiingo API response
         mock_tiingo_response = MagicMock()
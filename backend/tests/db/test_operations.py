@@ -0,0 +1,155 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from datetime import datetime, UTC
+from backend.app.db.models import Trade
+from backend.app.db.operations import DatabaseOperations, batched_insert, clear_read_cache, invalidate_table, submit_write
+
+class TestBatchedInsert(unittest.TestCase):
+    def test_rows_are_sent_in_chunks(self):
+        client = MagicMock()
+        client.table.return_value.insert.return_value.execute.return_value.data = [{'id': 1}]
+        rows = [{'equity': float(i), 'cash': float(i)} for i in range(5)]
+
+        inserted = batched_insert(client, 'equity', rows, chunk=2)
+
+        insert = client.table.return_value.insert
+        self.assertEqual(insert.call_count, 3)
+        self.assertEqual([len(call.args[0]) for call in insert.call_args_list], [2, 2, 1])
+        self.assertEqual(len(inserted), 3)
+        client.table.assert_called_with('equity')
+
+    def test_datetimes_are_serialized(self):
+        client = MagicMock()
+        timestamp = datetime(2024, 1, 2, tzinfo=UTC)
+
+        batched_insert(client, 'equity', [{'timestamp': timestamp, 'equity': 1.0}])
+
+        sent = client.table.return_value.insert.call_args.args[0]
+        self.assertEqual(sent, [{'timestamp': timestamp.isoformat(), 'equity': 1.0}])
+
+    def test_no_rows_makes_no_requests(self):
+        client = MagicMock()
+        self.assertEqual(batched_insert(client, 'equity', []), [])
+        client.table.assert_not_called()
+
+    def test_on_conflict_upserts(self):
+        client = MagicMock()
+
+        batched_insert(client, 'signals', [{'symbol': 'AAPL'}], on_conflict='symbol,timestamp,strategy')
+
+        client.table.return_value.upsert.assert_called_once_with(
+            [{'symbol': 'AAPL'}], on_conflict='symbol,timestamp,strategy'
+        )
+        client.table.return_value.insert.assert_not_called()
+
+class TestBulkOperations(unittest.TestCase):
+    @patch('backend.app.db.operations.DatabaseClient.get_instance')
+    def test_create_trades_bulk_single_request(self, mock_get_instance):
+        trades = [
+            Trade(order_id=f'order-{i}', symbol='AAPL', side='buy', quantity=1.0, price=100.0, strategy='SMA_RSI')
+            for i in range(3)
+        ]
+        insert = mock_get_instance.return_value.table.return_value.insert
+        insert.return_value.execute.return_value.data = [
+            {**trade.model_dump(), 'id': i} for i, trade in enumerate(trades)
+        ]
+
+        created = DatabaseOperations().create_trades_bulk(trades)
+
+        insert.assert_called_once()
+        self.assertEqual(len(insert.call_args.args[0]), 3)
+        self.assertEqual([trade.order_id for trade in created], ['order-0', 'order-1', 'order-2'])
+
+class TestSubmitWrite(unittest.TestCase):
+    def test_result_is_returned_through_future(self):
+        self.assertTrue(submit_write(lambda row: bool(row), {'equity': 1.0}).result(timeout=5))
+
+    @patch('backend.app.db.operations.logger')
+    def test_failures_are_logged(self, mock_logger):
+        logged = threading.Event()
+        mock_logger.error.side_effect = lambda *args, **kwargs: logged.set()
+
+        def failing_write():
+            raise RuntimeError("boom")
+
+        submit_write(failing_write)
+        self.assertTrue(logged.wait(timeout=5))
+
+class TestGetTrades(unittest.TestCase):
+    @patch('backend.app.db.operations.DatabaseClient.get_instance')
+    def test_before_uses_keyset_instead_of_offset(self, mock_get_instance):
+        ordered = mock_get_instance.return_value.table.return_value.select.return_value.order.return_value
+        ordered.lt.return_value.limit.return_value.execute.return_value.data = []
+        cursor = datetime(2024, 1, 2, tzinfo=UTC)
+
+        DatabaseOperations().get_trades(limit=50, before=cursor)
+
+        ordered.lt.assert_called_once_with('timestamp', cursor.isoformat())
+        ordered.lt.return_value.limit.assert_called_once_with(50)
+        ordered.range.assert_not_called()
+
+    @patch('backend.app.db.operations.DatabaseClient.get_instance')
+    def test_before_id_breaks_timestamp_ties(self, mock_get_instance):
+        select = mock_get_instance.return_value.table.return_value.select.return_value
+        params = select.order.return_value.params
+        cursor = datetime(2024, 1, 2, tzinfo=UTC)
+
+        DatabaseOperations().get_trades(limit=50, before=cursor, before_id=7)
+
+        select.order.assert_called_once_with('timestamp.desc,id', desc=True)
+        ts = cursor.isoformat()
+        params.add.assert_called_once_with('or', f'(timestamp.lt."{ts}",and(timestamp.eq."{ts}",id.lt.7))')
+        select.order.return_value.lt.assert_not_called()
+
+class TestIterators(unittest.TestCase):
+    @patch('backend.app.db.operations.DatabaseClient.get_instance')
+    def test_iter_trades_pages_until_short_chunk(self, mock_get_instance):
+        row = {'order_id': 'o', 'symbol': 'AAPL', 'side': 'buy', 'quantity': 1.0, 'price': 1.0, 'strategy': 'SMA_RSI'}
+        query = mock_get_instance.return_value.table.return_value.select.return_value.eq.return_value
+        query.order.return_value.range.return_value.execute.side_effect = [
+            MagicMock(data=[row, row]),
+            MagicMock(data=[row]),
+        ]
+
+        trades = list(DatabaseOperations().iter_trades(symbol='AAPL', chunk=2))
+
+        self.assertEqual(len(trades), 3)
+        self.assertEqual(
+            [call.args for call in query.order.return_value.range.call_args_list],
+            [(0, 1), (2, 3)]
+        )
+
+class TestReadCache(unittest.TestCase):
+    def setUp(self):
+        clear_read_cache()
+
+    def tearDown(self):
+        clear_read_cache()
+
+    @patch('backend.app.db.operations.DatabaseClient.get_instance')
+    def test_repeat_reads_are_cached(self, mock_get_instance):
+        execute = mock_get_instance.return_value.table.return_value.select.return_value.order.return_value.execute
+        execute.return_value.data = [{'equity': 100.0, 'cash': 50.0}]
+        db_ops = DatabaseOperations()
+
+        first = db_ops.get_equity_history()
+        second = db_ops.get_equity_history()
+
+        self.assertEqual(execute.call_count, 1)
+        self.assertEqual(second[0].cash, first[0].cash)
+
+    @patch('backend.app.db.operations.DatabaseClient.get_instance')
+    def test_write_invalidates_cached_reads(self, mock_get_instance):
+        execute = mock_get_instance.return_value.table.return_value.select.return_value.order.return_value.execute
+        execute.return_value.data = [{'equity': 100.0, 'cash': 50.0}]
+        db_ops = DatabaseOperations()
+
+        db_ops.get_equity_history()
+        invalidate_table('equity')
+        db_ops.get_equity_history()
+
+        self.assertEqual(execute.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,6 @@
+import json
 import unittest
+import numpy as np
 from unittest.mock import patch, MagicMock
 from datetime import datetime, UTC
 from backend.app.db.supabase import (
@@ -6,12 +8,15 @@ from backend.app.db.supabase import (
     update_trades,
     update_positions,
     update_equity,
+    update_signals,
+    commit_cycle,
     read_trades,
     read_positions,
     read_equity_history,
     validate_trade_data,
     validate_position_data,
-    validate_equity_data
+    validate_equity_data,
+    _validated_noop
 )
 
 SUPABASE_URL = 'https://your-supabase-url.supabase.co'
@@ -71,14 +76,14 @@ class TestSupabase(unittest.TestCase):
         invalid_equity.pop('equity')
         self.assertFalse(validate_equity_data(invalid_equity))
 
-    @patch('backend.app.db.supabase.requests.post')
+    @patch('backend.app.db.supabase._session.post')
     def test_setup_tables(self, mock_post):
         """Test table setup"""
         mock_post.return_value.status_code = 200
         setup_tables()
         self.assertEqual(mock_post.call_count, 3)  # One call for each table
 
-    @patch('backend.app.db.supabase.requests.post')
+    @patch('backend.app.db.supabase._session.post')
     def test_update_trades_success(self, mock_post):
         """Test successful trade update"""
         mock_post.return_value.status_code = 200
@@ -86,7 +91,28 @@ class TestSupabase(unittest.TestCase):
         self.assertTrue(result)
         mock_post.assert_called_once()
 
-    @patch('backend.app.db.supabase.requests.post')
+    @patch('backend.app.db.supabase._session.post')
+    def test_writes_accept_created_status(self, mock_post):
+        """Test PostgREST's 201 Created counts as success for every writer"""
+        mock_post.return_value.status_code = 201
+        signal = {'symbol': 'AAPL', 'signal_type': 'buy', 'strength': 0.8, 'strategy': 'SMA_RSI', 'price': 102.0}
+        self.assertTrue(update_trades(self.valid_trade))
+        self.assertTrue(update_positions(self.valid_position))
+        self.assertTrue(update_equity(self.valid_equity))
+        self.assertTrue(update_signals(signal))
+        self.assertEqual(mock_post.call_count, 4)
+
+    @patch('backend.app.db.supabase._session.post')
+    def test_update_trades_encodes_body(self, mock_post):
+        """Test trade payloads with datetimes and numpy prices are sent as JSON bytes"""
+        mock_post.return_value.status_code = 201
+        trade = dict(self.valid_trade, price=np.float64(102.5), timestamp=datetime(2024, 1, 2, tzinfo=UTC))
+        self.assertTrue(update_trades(trade))
+        body = json.loads(mock_post.call_args.kwargs['data'])
+        self.assertEqual(body['price'], 102.5)
+        self.assertTrue(body['timestamp'].startswith('2024-01-02T00:00:00'))
+
+    @patch('backend.app.db.supabase._session.post')
     def test_update_trades_duplicate_order_id(self, mock_post):
         """Test trade update with duplicate order_id"""
         mock_post.return_value.status_code = 409  # Conflict
@@ -94,7 +120,7 @@ class TestSupabase(unittest.TestCase):
         self.assertFalse(result)
         mock_post.assert_called_once()
 
-    @patch('backend.app.db.supabase.requests.post')
+    @patch('backend.app.db.supabase._session.post')
     def test_update_positions_success(self, mock_post):
         """Test successful position update"""
         mock_post.return_value.status_code = 200
@@ -102,7 +128,7 @@ class TestSupabase(unittest.TestCase):
         self.assertTrue(result)
         mock_post.assert_called_once()
 
-    @patch('backend.app.db.supabase.requests.post')
+    @patch('backend.app.db.supabase._session.post')
     def test_update_positions_upsert(self, mock_post):
         """Test position upsert functionality"""
         mock_post.return_value.status_code = 200
@@ -118,7 +144,7 @@ class TestSupabase(unittest.TestCase):
         
         self.assertEqual(mock_post.call_count, 2)
 
-    @patch('backend.app.db.supabase.requests.post')
+    @patch('backend.app.db.supabase._session.post')
     def test_update_equity_success(self, mock_post):
         """Test successful equity update"""
         mock_post.return_value.status_code = 200
@@ -126,7 +152,7 @@ class TestSupabase(unittest.TestCase):
         self.assertTrue(result)
         mock_post.assert_called_once()
 
-    @patch('backend.app.db.supabase.requests.post')
+    @patch('backend.app.db.supabase._session.post')
     def test_update_equity_duplicate_timestamp(self, mock_post):
         """Test equity update with duplicate timestamp"""
         mock_post.return_value.status_code = 200  # Should succeed due to upsert
@@ -134,7 +160,7 @@ class TestSupabase(unittest.TestCase):
         self.assertTrue(result)
         mock_post.assert_called_once()
 
-    @patch('backend.app.db.supabase.requests.get')
+    @patch('backend.app.db.supabase._session.get')
     def test_read_trades(self, mock_get):
         """Test reading trades from database"""
         mock_get.return_value.status_code = 200
@@ -144,7 +170,7 @@ class TestSupabase(unittest.TestCase):
         self.assertIsInstance(result, list)
         self.assertEqual(len(result), 1)
 
-    @patch('backend.app.db.supabase.requests.get')
+    @patch('backend.app.db.supabase._session.get')
     def test_read_positions(self, mock_get):
         """Test reading positions from database"""
         mock_get.return_value.status_code = 200
@@ -154,7 +180,7 @@ class TestSupabase(unittest.TestCase):
         self.assertIsInstance(result, list)
         self.assertEqual(len(result), 1)
 
-    @patch('backend.app.db.supabase.requests.get')
+    @patch('backend.app.db.supabase._session.get')
     def test_read_equity_history(self, mock_get):
         """Test reading equity history from database"""
         mock_get.return_value.status_code = 200
@@ -163,13 +189,84 @@ class TestSupabase(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertIsInstance(result, list)
         self.assertEqual(len(result), 1)
+        params = mock_get.call_args.kwargs['params']
+        self.assertTrue(params['timestamp'].startswith('gte.'))
+        self.assertNotIn('limit', params)
 
-    @patch('backend.app.db.supabase.requests.get')
+    @patch('backend.app.db.supabase._session.get')
     def test_read_operations_error_handling(self, mock_get):
         """Test error handling in read operations"""
         mock_get.return_value.status_code = 500
         result = read_trades()
         self.assertIsNone(result)
 
+    @patch('backend.app.db.supabase._session.post')
+    def test_commit_cycle_single_rpc(self, mock_post):
+        """A cycle is written with one call to the commit_trade_cycle function"""
+        mock_post.return_value = MagicMock(status_code=200)
+        self.assertTrue(commit_cycle(self.valid_trade, None, self.valid_equity))
+        mock_post.assert_called_once()
+        self.assertTrue(mock_post.call_args.args[0].endswith('/rest/v1/rpc/commit_trade_cycle'))
+        payload = json.loads(mock_post.call_args.kwargs['data'])
+        self.assertEqual(payload['trade_row']['order_id'], 'test123')
+        self.assertIsNone(payload['position_row'])
+        self.assertIsNone(payload['closed_symbol'])
+        self.assertEqual(payload['equity_row']['cash'], 90000.0)
+
+    @patch('backend.app.db.supabase._session.post')
+    def test_commit_cycle_falls_back_to_table_writes(self, mock_post):
+        """Without the function deployed, each row is written on its own"""
+        mock_post.side_effect = [MagicMock(status_code=404, text='not found')] + [MagicMock(status_code=201)] * 3
+        self.assertTrue(commit_cycle(self.valid_trade, self.valid_position, self.valid_equity))
+        urls = [call.args[0].rsplit('/', 1)[-1] for call in mock_post.call_args_list]
+        self.assertEqual(urls, ['commit_trade_cycle', 'trades', 'positions', 'equity'])
+
+    @patch('backend.app.db.supabase._session.delete')
+    @patch('backend.app.db.supabase._session.post')
+    def test_commit_cycle_fallback_deletes_closed_position(self, mock_post, mock_delete):
+        """A full close removes the positions row on the fallback path too"""
+        mock_post.side_effect = [MagicMock(status_code=404, text='not found')] + [MagicMock(status_code=201)] * 2
+        mock_delete.return_value = MagicMock(status_code=204)
+        self.assertTrue(commit_cycle(self.valid_trade, None, self.valid_equity, closed_symbol='AAPL'))
+        self.assertTrue(mock_delete.call_args.args[0].endswith('/rest/v1/positions'))
+        self.assertEqual(mock_delete.call_args.kwargs['params'], {'symbol': 'eq.AAPL'})
+
+    @patch('backend.app.db.supabase._session.post')
+    def test_commit_cycle_falls_back_on_pgrst202(self, mock_post):
+        missing = MagicMock(status_code=400, text='missing')
+        missing.json.return_value = {'code': 'PGRST202'}
+        mock_post.side_effect = [missing] + [MagicMock(status_code=201)] * 2
+        self.assertTrue(commit_cycle(self.valid_trade, None, self.valid_equity))
+        self.assertEqual(mock_post.call_count, 3)
+
+    @patch('backend.app.db.supabase._session.post')
+    def test_commit_cycle_rejection_does_not_fall_back(self, mock_post):
+        """A constraint or data error must not turn into separate, non-atomic writes"""
+        conflict = MagicMock(status_code=409, text='duplicate key')
+        conflict.json.return_value = {'code': '23505'}
+        mock_post.return_value = conflict
+        self.assertFalse(commit_cycle(self.valid_trade, self.valid_position, self.valid_equity))
+        mock_post.assert_called_once()
+
+    @patch('backend.app.db.supabase._session.post')
+    def test_commit_cycle_transport_error_does_not_fall_back(self, mock_post):
+        mock_post.side_effect = Exception("timed out")
+        self.assertFalse(commit_cycle(self.valid_trade, self.valid_position, self.valid_equity))
+        mock_post.assert_called_once()
+
+    @patch('backend.app.db.supabase._session.post')
+    def test_commit_cycle_rejects_invalid_rows(self, mock_post):
+        self.assertFalse(commit_cycle(self.valid_trade, {'symbol': 'AAPL'}, self.valid_equity))
+        mock_post.assert_not_called()
+
+    @patch('backend.app.db.supabase._session.post')
+    def test_validated_noop_skips_network(self, mock_post):
+        """Test-mode writers keep validation but never post"""
+        write = _validated_noop(validate_trade_data, "trade")
+        self.assertTrue(write(self.valid_trade))
+        self.assertFalse(write({'symbol': 'AAPL'}))
+        self.assertFalse(write({}))
+        mock_post.assert_not_called()
+
 if __name__ == "__main__":
     unittest.main() 
@@ -0,0 +1,35 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from postgrest.exceptions import APIError
+
+from backend.app.services.background import _acquire_bot_lease
+
+
+class TestBotLease(unittest.TestCase):
+    def _rpc(self, mock_get_instance):
+        return mock_get_instance.return_value.rpc.return_value.execute
+
+    @patch('backend.app.services.background.DatabaseClient.get_instance')
+    def test_granted_lease(self, mock_get_instance):
+        self._rpc(mock_get_instance).return_value = MagicMock(data=True)
+        self.assertTrue(_acquire_bot_lease(900, MagicMock()))
+
+    @patch('backend.app.services.background.DatabaseClient.get_instance')
+    def test_lease_held_elsewhere(self, mock_get_instance):
+        self._rpc(mock_get_instance).return_value = MagicMock(data=False)
+        self.assertFalse(_acquire_bot_lease(900, MagicMock()))
+
+    @patch('backend.app.services.background.DatabaseClient.get_instance')
+    def test_missing_function_disables_leader_election(self, mock_get_instance):
+        self._rpc(mock_get_instance).side_effect = APIError({'code': 'PGRST202', 'message': 'not found'})
+        self.assertTrue(_acquire_bot_lease(900, MagicMock()))
+
+    @patch('backend.app.services.background.DatabaseClient.get_instance')
+    def test_transient_error_stands_by(self, mock_get_instance):
+        self._rpc(mock_get_instance).side_effect = ConnectionError("connection reset")
+        self.assertFalse(_acquire_bot_lease(900, MagicMock()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -132,3 +132,10 @@ def test_rate_limiting():
     for _ in range(31):
         response = client.get("/api/portfolio", headers=API_HEADERS)
     assert response.status_code == 429
+
+
+def test_health_is_throttled():
+    for _ in range(31):
+        response = client.get("/health")
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
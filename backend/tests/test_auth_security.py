@@ -213,7 +213,7 @@ class TestRateLimiting:
         
         # Import the API router to check for rate limiting decorators
         try:
-            from backend.app.api.endpoints.portfolio import limiter
+            from backend.app.api.limiter import limiter
         except ImportError:
             pytest.skip("Rate limiting not implemented")
 
@@ -226,7 +226,7 @@ class TestRateLimiting:
         """Test rate limiting configuration."""
         
         try:
-            from backend.app.api.endpoints.portfolio import limiter
+            from backend.app.api.limiter import limiter
         except ImportError:
             pytest.skip("Rate limiting not implemented")
 
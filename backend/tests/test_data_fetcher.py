@@ -22,7 +22,7 @@ from backend.app.services.fetcher import fetch_ohlcv
 class TestDataFetcher:
     """Test suite for market data fetching."""
     
-    @patch('backend.app.services.fetcher.requests.get')
+    @patch('backend.app.services.fetcher._session.get')
     def test_fetch_ohlcv_tiingo_success(self, mock_get):
         """Test successful data fetch from Tiingo API."""
         
@@ -58,7 +58,7 @@ class TestDataFetcher:
         assert result['close'].iloc[0] == 102.0
         assert result['close'].iloc[1] == 105.0
     
-    @patch('backend.app.services.fetcher.requests.get')
+    @patch('backend.app.services.fetcher._session.get')
     def test_fetch_ohlcv_alpha_vantage_fallback(self, mock_get):
         """Test fallback to Alpha Vantage when Tiingo fails."""
         
@@ -106,7 +106,7 @@ class TestDataFetcher:
     
     @patch('backend.app.services.fetcher.YFINANCE_AVAILABLE', True)
     @patch('backend.app.services.fetcher._fetch_yfinance')
-    @patch('backend.app.services.fetcher.requests.get')
+    @patch('backend.app.services.fetcher._session.get')
     def test_fetch_ohlcv_yfinance_fallback(self, mock_get, mock_fetch_yf):
         """Test fallback to yfinance when both APIs fail."""
         
@@ -135,7 +135,7 @@ class TestDataFetcher:
         assert all(col in result.columns for col in ['open', 'high', 'low', 'close', 'volume'])
     
     @patch('backend.app.services.fetcher._fetch_yfinance')
-    @patch('backend.app.services.fetcher.requests.get')
+    @patch('backend.app.services.fetcher._session.get')
     def test_fetch_ohlcv_all_sources_fail(self, mock_get, mock_fetch_yf):
         """Test when all data sources fail."""
         
@@ -151,7 +151,7 @@ class TestDataFetcher:
         
         assert result is None or (isinstance(result, pd.DataFrame) and result.empty)
     
-    @patch('backend.app.services.fetcher.requests.get')
+    @patch('backend.app.services.fetcher._session.get')
     def test_fetch_ohlcv_handles_malformed_response(self, mock_get):
         """Test handling of malformed API responses."""
         
@@ -169,7 +169,7 @@ class TestDataFetcher:
         # Should handle gracefully and return None or empty DataFrame
         assert result is None or (isinstance(result, pd.DataFrame) and result.empty)
     
-    @patch('backend.app.services.fetcher.requests.get')
+    @patch('backend.app.services.fetcher._session.get')
     def test_fetch_ohlcv_handles_empty_response(self, mock_get):
         """Test handling of empty but valid API responses."""
         
@@ -183,7 +183,7 @@ class TestDataFetcher:
         
         assert result is None or (isinstance(result, pd.DataFrame) and result.empty)
     
-    @patch('backend.app.services.fetcher.requests.get')
+    @patch('backend.app.services.fetcher._session.get')
     def test_fetch_ohlcv_handles_network_timeout(self, mock_get):
         """Test handling of network timeouts."""
         
@@ -194,7 +194,7 @@ class TestDataFetcher:
         # Should handle timeout gracefully
         assert result is None or (isinstance(result, pd.DataFrame) and result.empty)
     
-    @patch('backend.app.services.fetcher.requests.get')
+    @patch('backend.app.services.fetcher._session.get')
     def test_fetch_ohlcv_handles_connection_error(self, mock_get):
         """Test handling of connection errors."""
         
@@ -221,7 +221,7 @@ class TestDataFetcher:
 class TestDataCaching:
     """Test data caching functionality if implemented."""
     
-    @patch('backend.app.services.fetcher.requests.get')
+    @patch('backend.app.services.fetcher._session.get')
     def test_cache_hit_avoids_api_call(self, mock_get):
         """Test that cached data avoids redundant API calls."""
         
@@ -260,7 +260,7 @@ class TestDataCaching:
 class TestDataValidation:
     """Test data validation and cleaning."""
     
-    @patch('backend.app.services.fetcher.requests.get')
+    @patch('backend.app.services.fetcher._session.get')
     def test_data_validation_filters_invalid_prices(self, mock_get):
         """Test that invalid price data is filtered out."""
         
@@ -296,7 +296,7 @@ class TestDataValidation:
                 assert all(valid_rows['high'] > 0)
                 assert all(valid_rows['close'] > 0)
     
-    @patch('backend.app.services.fetcher.requests.get')
+    @patch('backend.app.services.fetcher._session.get')
     def test_data_validation_handles_missing_fields(self, mock_get):
         """Test handling of responses with missing required fields."""
         
@@ -324,7 +324,7 @@ class TestRetryLogic:
     """Test retry and exponential backoff logic."""
     
     @patch('backend.app.services.fetcher.time.sleep')
-    @patch('backend.app.services.fetcher.requests.get')
+    @patch('backend.app.services.fetcher._session.get')
     def test_retry_on_temporary_failure(self, mock_get, mock_sleep):
         """Test retry logic on temporary API failures."""
         
@@ -357,7 +357,7 @@ class TestRetryLogic:
             # If no retry logic, should still handle gracefully
             pass
     
-    @patch('backend.app.services.fetcher.requests.get')
+    @patch('backend.app.services.fetcher._session.get')
     def test_gives_up_after_max_retries(self, mock_get):
         """Test that retry logic eventually gives up."""
         
@@ -62,9 +62,7 @@ def _mock_db_ops(empty_positions=True):
 
 class TestEndToEnd:
     @patch('backend.app.main.DatabaseOperations')
-    @patch('backend.app.main.update_equity')
-    @patch('backend.app.main.update_positions')
-    @patch('backend.app.main.update_trades')
+    @patch('backend.app.main.commit_cycle')
     @patch('backend.app.main.execute_trade')
     @patch('backend.app.main.calculate_position_size')
     @patch('backend.app.main.generate_signals')
@@ -77,9 +75,7 @@ class TestEndToEnd:
         mock_generate_signals,
         mock_calculate_position_size,
         mock_execute_trade,
-        mock_update_trades,
-        mock_update_positions,
-        mock_update_equity,
+        mock_commit_cycle,
         mock_db_ops_factory,
         mock_config,
         mock_ohlcv_data,
@@ -99,9 +95,7 @@ class TestEndToEnd:
         mock_generate_signals.assert_called_once()
         mock_calculate_position_size.assert_called_once()
         mock_execute_trade.assert_called_once()
-        assert mock_update_trades.called
-        assert mock_update_positions.called
-        assert mock_update_equity.called
+        assert mock_commit_cycle.called
 
     @patch('backend.app.main.DatabaseOperations')
     @patch('backend.app.main.fetch_ohlcv')
@@ -1,11 +1,18 @@
 
 import unittest
+from concurrent.futures import Future
 from unittest.mock import patch, MagicMock
 import pandas as pd
-from backend.app.main import run_trading_cycle, main
+from backend.app.main import run_trading_cycle, main, _merge_position
 
 TOP5_DOW = ["AAPL", "MSFT", "JNJ", "UNH", "V"]
 
+def run_now(func, *args, **kwargs):
+    """Stand-in for submit_write that runs the write inline."""
+    future = Future()
+    future.set_result(func(*args, **kwargs))
+    return future
+
 class TestMain(unittest.TestCase):
     @patch('backend.app.main.DatabaseOperations')
     @patch('backend.app.main.load_config')
@@ -13,11 +20,9 @@ class TestMain(unittest.TestCase):
     @patch('backend.app.main.generate_signals')
     @patch('backend.app.main.calculate_position_size')
     @patch('backend.app.main.execute_trade')
-    @patch('backend.app.main.update_trades')
-    @patch('backend.app.main.update_positions')
-    @patch('backend.app.main.update_equity')
+    @patch('backend.app.main.commit_cycle')
     @patch('backend.app.main.update_signals')
-    def test_run_trading_cycle_success(self, mock_update_signals, mock_update_equity, mock_update_positions, mock_update_trades, mock_execute_trade, mock_calculate_position_size, mock_generate_signals, mock_fetch_ohlcv, mock_load_config, mock_db_ops):
+    def test_run_trading_cycle_success(self, mock_update_signals, mock_commit_cycle, mock_execute_trade, mock_calculate_position_size, mock_generate_signals, mock_fetch_ohlcv, mock_load_config, mock_db_ops):
         mock_load_config.return_value = {'TIINGO_API_KEY': 'test-key', 'SUPABASE_URL': 'test-url', 'SUPABASE_KEY': 'test-key', 'STARTING_EQUITY': 100000}
         mock_fetch_ohlcv.return_value = pd.DataFrame({'close': [100.0]})
         mock_generate_signals.return_value = {'signal': 1, 'side': 'buy', 'strength': 0.8}
@@ -38,26 +43,128 @@ class TestMain(unittest.TestCase):
 
         run_trading_cycle(symbol='AAPL')
 
-        mock_update_trades.assert_called_once()
-        mock_update_positions.assert_called_once()
-        mock_update_equity.assert_called_once()
+        mock_commit_cycle.assert_called_once()
+        mock_db_ops.return_value.get_equity_history.assert_called_once()
+        trade, position, equity = mock_commit_cycle.call_args.args
+        self.assertEqual(trade, mock_execute_trade.return_value)
+        self.assertEqual(position['quantity'], 10)
+        # 50000 cash - 10 shares @ 100 bought, plus the new 10-share position
+        self.assertEqual(equity['cash'], 49000.0)
+        self.assertEqual(equity['equity'], 50000.0)
+
+    @patch('backend.app.main.DatabaseOperations')
+    @patch('backend.app.main.load_config')
+    @patch('backend.app.main.fetch_ohlcv')
+    @patch('backend.app.main.generate_signals')
+    @patch('backend.app.main.calculate_position_size')
+    @patch('backend.app.main.execute_trade')
+    @patch('backend.app.main.commit_cycle')
+    @patch('backend.app.main.update_signals')
+    def test_full_sell_values_portfolio_without_rereading_positions(self, mock_update_signals, mock_commit_cycle, mock_execute_trade, mock_calculate_position_size, mock_generate_signals, mock_fetch_ohlcv, mock_load_config, mock_db_ops):
+        mock_load_config.return_value = {'STARTING_EQUITY': 100000}
+        mock_fetch_ohlcv.return_value = pd.DataFrame({'close': [100.0]})
+        mock_generate_signals.return_value = {'signal': -1, 'side': 'sell', 'strength': 0.8}
+        mock_calculate_position_size.return_value = {'position_size': 10}
+        mock_execute_trade.return_value = {
+            'symbol': 'AAPL',
+            'side': 'sell',
+            'quantity': 10,
+            'price': 100.0,
+            'timestamp': pd.Timestamp('2024-01-01'),
+            'strategy': 'test'
+        }
+        held = [
+            MagicMock(symbol='AAPL', quantity=10, current_price=90.0, average_entry_price=80.0),
+            MagicMock(symbol='MSFT', quantity=5, current_price=200.0, average_entry_price=150.0),
+        ]
+        mock_db_ops.return_value.get_positions.return_value = held
+        mock_db_ops.return_value.get_equity_history.return_value = [MagicMock(cash=50000.0)]
+
+        run_trading_cycle(symbol='AAPL')
+
+        mock_db_ops.return_value.get_positions.assert_called_once()
+        mock_db_ops.return_value.get_equity_history.assert_called_once()
+        _, position, equity = mock_commit_cycle.call_args.args
+        self.assertIsNone(position)
+        self.assertEqual(mock_commit_cycle.call_args.kwargs['closed_symbol'], 'AAPL')
+        # Sold AAPL leaves only the MSFT position alongside the proceeds
+        self.assertEqual(equity['cash'], 51000.0)
+        self.assertEqual(equity['equity'], 52000.0)
+
+    @patch('backend.app.main.monitor')
+    @patch('backend.app.main.DatabaseOperations')
+    @patch('backend.app.main.load_config')
+    @patch('backend.app.main.fetch_ohlcv')
+    @patch('backend.app.main.generate_signals')
+    @patch('backend.app.main.calculate_position_size')
+    @patch('backend.app.main.execute_trade')
+    @patch('backend.app.main.commit_cycle')
+    @patch('backend.app.main.update_signals')
+    def test_failed_commit_is_recorded_as_failure(self, mock_update_signals, mock_commit_cycle, mock_execute_trade, mock_calculate_position_size, mock_generate_signals, mock_fetch_ohlcv, mock_load_config, mock_db_ops, mock_monitor):
+        mock_load_config.return_value = {'STARTING_EQUITY': 100000}
+        mock_fetch_ohlcv.return_value = pd.DataFrame({'close': [100.0]})
+        mock_generate_signals.return_value = {'signal': 1, 'side': 'buy', 'strength': 0.8}
+        mock_calculate_position_size.return_value = {'position_size': 10}
+        mock_execute_trade.return_value = {
+            'symbol': 'AAPL', 'side': 'buy', 'quantity': 10, 'price': 100.0,
+            'timestamp': pd.Timestamp('2024-01-01'), 'strategy': 'test'
+        }
+        mock_db_ops.return_value.get_positions.return_value = []
+        mock_db_ops.return_value.get_equity_history.return_value = [MagicMock(cash=50000.0)]
+        mock_commit_cycle.return_value = False
+
+        run_trading_cycle(symbol='AAPL')
+
+        mock_monitor.record_failure.assert_called_once()
+        mock_monitor.record_success.assert_not_called()
 
     @patch('backend.app.main.DatabaseOperations')
     @patch('backend.app.main.load_config')
     @patch('backend.app.main.fetch_ohlcv')
-    @patch('backend.app.main.update_trades')
-    @patch('backend.app.main.update_positions')
-    @patch('backend.app.main.update_equity')
-    def test_run_trading_cycle_fetch_failure(self, mock_update_equity, mock_update_positions, mock_update_trades, mock_fetch_ohlcv, mock_load_config, mock_db_ops):
+    @patch('backend.app.main.commit_cycle')
+    def test_run_trading_cycle_fetch_failure(self, mock_commit_cycle, mock_fetch_ohlcv, mock_load_config, mock_db_ops):
         mock_load_config.return_value = {'TIINGO_API_KEY': 'test-key', 'SUPABASE_URL': 'test-url', 'SUPABASE_KEY': 'test-key'}
         mock_fetch_ohlcv.return_value = None
         mock_db_ops.return_value.get_recent_trades.return_value = []
 
         run_trading_cycle(symbol='AAPL')
 
-        self.assertFalse(mock_update_trades.called)
-        self.assertFalse(mock_update_positions.called)
-        self.assertFalse(mock_update_equity.called)
+        self.assertFalse(mock_commit_cycle.called)
+
+    @patch('backend.app.main.DatabaseOperations')
+    @patch('backend.app.main.load_config')
+    @patch('backend.app.main.fetch_ohlcv')
+    @patch('backend.app.main.generate_signals')
+    @patch('backend.app.main.calculate_position_size')
+    @patch('backend.app.main.submit_write', side_effect=run_now)
+    @patch('backend.app.main.update_signals')
+    def test_unchanged_hold_signal_written_once(self, mock_update_signals, mock_submit_write, mock_calculate_position_size, mock_generate_signals, mock_fetch_ohlcv, mock_load_config, mock_db_ops):
+        mock_load_config.return_value = {'STARTING_EQUITY': 100000}
+        mock_fetch_ohlcv.return_value = pd.DataFrame({'close': [100.0]})
+        mock_calculate_position_size.return_value = None
+        mock_db_ops.return_value.get_positions.return_value = []
+
+        mock_generate_signals.return_value = {'signal': 0, 'side': 'hold', 'strength': 0.5}
+        run_trading_cycle(symbol='AAPL')
+        run_trading_cycle(symbol='AAPL')
+        self.assertEqual(mock_update_signals.call_count, 1)
+
+        mock_generate_signals.return_value = {'signal': 0, 'side': 'hold', 'strength': 0.6}
+        run_trading_cycle(symbol='AAPL')
+        self.assertEqual(mock_update_signals.call_count, 2)
+
+        # A failed write isn't remembered, so the same signal is retried next cycle
+        mock_generate_signals.return_value = {'signal': 0, 'side': 'hold', 'strength': 0.7}
+        mock_update_signals.return_value = False
+        run_trading_cycle(symbol='AAPL')
+        run_trading_cycle(symbol='AAPL')
+        self.assertEqual(mock_update_signals.call_count, 4)
+
+    def test_merge_position_weights_average_price(self):
+        total, avg, unrealized = _merge_position(10, 90.0, 10, 110.0)
+        self.assertEqual(total, 20)
+        self.assertEqual(avg, 100.0)
+        self.assertEqual(unrealized, 200.0)
 
     @patch('backend.app.main.run_background_bot')
     @patch('backend.app.main.argparse.ArgumentParser.parse_args')
@@ -91,7 +198,7 @@ class TestMain(unittest.TestCase):
 
         main()
 
-        mock_run_background_bot.assert_called_once_with('AAPL', 3600, 1, 8080)
+        mock_run_background_bot.assert_called_once_with('AAPL', 3600, 1)
 
 if __name__ == "__main__":
     unittest.main()
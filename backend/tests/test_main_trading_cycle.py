@@ -28,12 +28,9 @@ class TestTradingCycle:
     @patch('backend.app.main.generate_signals')
     @patch('backend.app.main.calculate_position_size')
     @patch('backend.app.main.execute_trade')
-    @patch('backend.app.main.update_trades')
-    @patch('backend.app.main.update_positions')
-    @patch('backend.app.main.update_equity')
-    @patch('backend.app.main.update_signals')
-    def test_successful_buy_trade_cycle(self, mock_update_signals, mock_update_equity, 
-                                       mock_update_positions, mock_update_trades, 
+    @patch('backend.app.main.commit_cycle')
+    @patch('backend.app.main.submit_write')
+    def test_successful_buy_trade_cycle(self, mock_submit_write, mock_commit_cycle,
                                        mock_execute_trade, mock_calculate_position_size,
                                        mock_generate_signals, mock_fetch_ohlcv, 
                                        mock_db_ops, mock_load_config):
@@ -91,15 +88,11 @@ class TestTradingCycle:
         mock_generate_signals.assert_called_once()
         mock_calculate_position_size.assert_called_once()
         mock_execute_trade.assert_called_once_with(10, symbol='AAPL', side='buy', simulate=True)
-        mock_update_trades.assert_called_once()
-        mock_update_positions.assert_called_once()
-        mock_update_equity.assert_called_once()
-        mock_update_signals.assert_called_once()
+        mock_commit_cycle.assert_called_once()
+        mock_submit_write.assert_called_once()
     
     @patch('backend.app.main.update_signals')
-    @patch('backend.app.main.update_equity')
-    @patch('backend.app.main.update_positions')
-    @patch('backend.app.main.update_trades')
+    @patch('backend.app.main.commit_cycle')
     @patch('backend.app.main.execute_trade')
     @patch('backend.app.main.calculate_position_size')
     @patch('backend.app.main.generate_signals')
@@ -108,8 +101,7 @@ class TestTradingCycle:
     @patch('backend.app.main.load_config')
     def test_continues_when_recent_trade_exists(self, mock_load_config, mock_db_ops, mock_fetch_ohlcv,
                                                 mock_generate_signals, mock_calculate_position_size,
-                                                mock_execute_trade, mock_update_trades,
-                                                mock_update_positions, mock_update_equity,
+                                                mock_execute_trade, mock_commit_cycle,
                                                 mock_update_signals):
         """Trading cycle should still run even if a trade already occurred today."""
 
@@ -232,12 +224,9 @@ class TestPositionManagement:
     @patch('backend.app.main.generate_signals')
     @patch('backend.app.main.calculate_position_size')
     @patch('backend.app.main.execute_trade')
-    @patch('backend.app.main.update_trades')
-    @patch('backend.app.main.update_positions')
-    @patch('backend.app.main.update_equity')
+    @patch('backend.app.main.commit_cycle')
     @patch('backend.app.main.update_signals')
-    def test_sell_validation_prevents_invalid_sell(self, mock_update_signals, mock_update_equity,
-                                                   mock_update_positions, mock_update_trades,
+    def test_sell_validation_prevents_invalid_sell(self, mock_update_signals, mock_commit_cycle,
                                                    mock_execute_trade, mock_calculate_position_size,
                                                    mock_generate_signals, mock_fetch_ohlcv,
                                                    mock_db_ops, mock_load_config):
@@ -269,7 +258,8 @@ class TestPositionManagement:
         
         # Verify that execute_trade was NOT called (invalid sell prevented)
         mock_execute_trade.assert_not_called()
-        mock_update_trades.assert_not_called()
+        mock_commit_cycle.assert_not_called()
+        db_instance.get_equity_history.assert_not_called()
 
 
 class TestErrorHandling:
@@ -1,7 +1,9 @@
 import unittest
 from unittest.mock import patch
 import logging
-from backend.app.utils.helpers import log_function_call, exponential_backoff
+from datetime import datetime
+from backend.app.utils.helpers import log_function_call, exponential_backoff, is_market_open, get_time_until_market_open
+from backend.app.utils.ratelimit import TokenBucket
 
 class TestUtils(unittest.TestCase):
     @patch('backend.app.utils.helpers.logger')
@@ -23,6 +25,29 @@ class TestUtils(unittest.TestCase):
             test_func()
         self.assertTrue(mock_logger.error.called)
 
+    @patch('backend.app.utils.helpers.logger')
+    def test_log_function_call_logs_recursive_calls_once(self, mock_logger):
+        @log_function_call
+        def countdown(n):
+            return countdown(n - 1) if n else 0
+        countdown(3)
+        self.assertEqual(mock_logger.info.call_count, 2)
+        countdown(1)
+        self.assertEqual(mock_logger.info.call_count, 4)
+
+    @patch('time.sleep')
+    def test_exponential_backoff_recovers(self, mock_sleep):
+        attempts = []
+
+        @exponential_backoff(max_retries=3, base_delay=1)
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ValueError("transient")
+            return "ok"
+        self.assertEqual(flaky(), "ok")
+        self.assertEqual([call.args[0] for call in mock_sleep.call_args_list], [1, 2])
+
     @patch('time.sleep')
     def test_exponential_backoff(self, mock_sleep):
         @exponential_backoff(max_retries=3, base_delay=1)
@@ -41,5 +66,54 @@ class TestUtils(unittest.TestCase):
             test_func()
         self.assertEqual(mock_sleep.call_count, 3)
 
+class TestTokenBucket(unittest.TestCase):
+    def test_allows_burst_then_limits(self):
+        bucket = TokenBucket(rate=1, capacity=3)
+        results = [bucket.consume("client", now=100.0) for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_refills_over_time(self):
+        bucket = TokenBucket(rate=0.5, capacity=1)
+        self.assertTrue(bucket.consume("client", now=0.0))
+        self.assertFalse(bucket.consume("client", now=1.0))
+        self.assertTrue(bucket.consume("client", now=3.0))
+
+    def test_sweep_drops_idle_clients(self):
+        bucket = TokenBucket(rate=1, capacity=2, idle_ttl=10)
+        bucket._last_sweep = 0.0
+        bucket.consume("idle", now=0.0)
+        bucket.consume("active", now=20.0)
+        self.assertNotIn("idle", bucket.buckets)
+        self.assertIn("active", bucket.buckets)
+
+class TestMarketHours(unittest.TestCase):
+    # Monday 2024-01-08 10:00 ET, Saturday 2024-01-06 12:00 ET, Monday 2024-01-08 08:30 ET
+    WEEKDAY_OPEN = 1704726000
+    SATURDAY = 1704560400
+    WEEKDAY_PREMARKET = 1704720600
+
+    @patch('backend.app.utils.helpers.time.time')
+    def test_market_hours(self, mock_time):
+        mock_time.return_value = self.WEEKDAY_OPEN
+        self.assertTrue(is_market_open())
+        self.assertEqual(get_time_until_market_open(), 0)
+
+        mock_time.return_value = self.SATURDAY
+        self.assertFalse(is_market_open())
+
+        mock_time.return_value = self.WEEKDAY_PREMARKET
+        self.assertFalse(is_market_open())
+        self.assertEqual(get_time_until_market_open(), 3600)
+
+    @patch('backend.app.utils.helpers.datetime', wraps=datetime)
+    @patch('backend.app.utils.helpers.time.time')
+    def test_results_cached_within_a_second(self, mock_time, mock_datetime):
+        mock_time.return_value = self.WEEKDAY_OPEN + 60.25
+        is_market_open()
+        mock_datetime.fromtimestamp.reset_mock()
+        mock_time.return_value = self.WEEKDAY_OPEN + 60.75
+        is_market_open()
+        mock_datetime.fromtimestamp.assert_not_called()
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
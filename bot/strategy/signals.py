@@ -3,8 +3,92 @@ import numpy as np
 from typing import Dict, Optional
 import logging
 
+try:
+    from numba import njit
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    def njit(*_args, **_kwargs):
+        """Fallback no-op decorator used when numba is unavailable."""
+        def decorator(func):
+            return func
+
+        return decorator
+
 logger = logging.getLogger(__name__)
 
+
+@njit(cache=True)
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing simple moving average matching pandas rolling(window).mean().
+    Positions without a full window of non-NaN values are NaN.
+    """
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    total = 0.0
+    nan_count = 0
+    for i in range(n):
+        value = values[i]
+        if np.isnan(value):
+            nan_count += 1
+        else:
+            total += value
+        if i >= window:
+            old = values[i - window]
+            if np.isnan(old):
+                nan_count -= 1
+            else:
+                total -= old
+        if i >= window - 1 and nan_count == 0:
+            out[i] = total / window
+    return out
+
+
+@njit(cache=True)
+def _relative_strength_index(close: np.ndarray, period: int) -> np.ndarray:
+    """RSI from simple rolling averages of gains and losses."""
+    n = close.shape[0]
+    gains = np.zeros(n)
+    losses = np.zeros(n)
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            gains[i] = delta
+        elif delta < 0:
+            losses[i] = -delta
+
+    avg_gain = _rolling_mean(gains, period)
+    avg_loss = _rolling_mean(losses, period)
+
+    rsi = np.full(n, np.nan)
+    for i in range(n):
+        gain = avg_gain[i]
+        loss = avg_loss[i]
+        if np.isnan(gain) or np.isnan(loss):
+            continue
+        if loss == 0.0:
+            if gain > 0.0:
+                rsi[i] = 100.0  # No losses in window: RS is infinite
+        else:
+            rsi[i] = 100.0 - (100.0 / (1.0 + gain / loss))
+    return rsi
+
+
+@njit(cache=True)
+def _crossover_signals(fast: np.ndarray, slow: np.ndarray, rsi: np.ndarray) -> np.ndarray:
+    """
+    Per-row crossover signal: 1 (buy) when fast > slow and RSI < 70,
+    -1 (sell) when fast < slow and RSI > 30, else 0. NaN inputs yield 0.
+    """
+    n = fast.shape[0]
+    out = np.zeros(n, dtype=np.int64)
+    for i in range(n):
+        if fast[i] > slow[i] and rsi[i] < 70.0:
+            out[i] = 1
+        elif fast[i] < slow[i] and rsi[i] > 30.0:
+            out[i] = -1
+    return out
+
+
 def calculate_signal_strength(data: pd.DataFrame, signal: int) -> float:
     """
     Calculate signal strength based on technical indicators.
@@ -81,35 +165,34 @@ def generate_signals(data: pd.DataFrame, use_precalculated: bool = False, existi
 
     if not use_precalculated:
         # Calculate indicators
+        close = data['close'].to_numpy(dtype=np.float64)
         if use_fallback:
             # Fallback: Use 10/20 SMA instead of 20/50
-            data['SMA10'] = data['close'].rolling(window=10).mean()
-            data['SMA20'] = data['close'].rolling(window=20).mean()
+            data['SMA10'] = _rolling_mean(close, 10)
+            data['SMA20'] = _rolling_mean(close, 20)
             data['SMA50'] = np.nan  # Mark as unavailable
         else:
             # Standard: 20/50 SMA
-            data['SMA20'] = data['close'].rolling(window=20).mean()
-            data['SMA50'] = data['close'].rolling(window=50).mean()
+            data['SMA20'] = _rolling_mean(close, 20)
+            data['SMA50'] = _rolling_mean(close, 50)
 
         # Calculate RSI
-        delta = data['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        data['RSI'] = 100 - (100 / (1 + rs))
+        data['RSI'] = _relative_strength_index(close, 14)
 
     # Generate signals
-    data['signal'] = 0
-    
     if use_fallback and 'SMA10' in data.columns:
         # Fallback strategy: 10/20 SMA crossover
-        data.loc[(data['SMA10'] > data['SMA20']) & (data['RSI'] < 70), 'signal'] = 1  # Buy
-        data.loc[(data['SMA10'] < data['SMA20']) & (data['RSI'] > 30), 'signal'] = -1  # Sell
+        fast_sma, slow_sma = data['SMA10'], data['SMA20']
         logger.info("Using fallback strategy: 10/20 SMA crossover")
     else:
         # Standard strategy: 20/50 SMA crossover
-        data.loc[(data['SMA20'] > data['SMA50']) & (data['RSI'] < 70), 'signal'] = 1  # Buy
-        data.loc[(data['SMA20'] < data['SMA50']) & (data['RSI'] > 30), 'signal'] = -1  # Sell
+        fast_sma, slow_sma = data['SMA20'], data['SMA50']
+
+    data['signal'] = _crossover_signals(
+        fast_sma.to_numpy(dtype=np.float64),
+        slow_sma.to_numpy(dtype=np.float64),
+        data['RSI'].to_numpy(dtype=np.float64)
+    )
 
     # Get the latest signal
     latest_signal = data['signal'].iloc[-1]
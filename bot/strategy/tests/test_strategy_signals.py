@@ -1,7 +1,7 @@
 import unittest
 import pandas as pd
 import numpy as np
-from bot.strategy.signals import generate_signals
+from bot.strategy.signals import generate_signals, _rolling_mean, _relative_strength_index
 
 class TestSignalsStrategy(unittest.TestCase):
     def setUp(self):
@@ -48,5 +48,18 @@ class TestSignalsStrategy(unittest.TestCase):
         self.assertIn('signal', result)
         self.assertIn('data', result)
 
+    def test_indicator_kernels_match_pandas(self):
+        close = pd.Series(np.random.rand(120) * 100 + 50)
+        values = close.to_numpy(dtype=np.float64)
+
+        expected_sma = close.rolling(window=20).mean().to_numpy()
+        np.testing.assert_allclose(_rolling_mean(values, 20), expected_sma, rtol=1e-9, equal_nan=True)
+
+        delta = close.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        expected_rsi = (100 - (100 / (1 + gain / loss))).to_numpy()
+        np.testing.assert_allclose(_relative_strength_index(values, 14), expected_rsi, rtol=1e-9, equal_nan=True)
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
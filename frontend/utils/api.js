@@ -52,7 +52,8 @@ class ApiClient {
   async getTrades(page = 1, pageSize = 20, symbol = null) {
     const params = new URLSearchParams({
       page: page.toString(),
-      page_size: pageSize.toString()
+      page_size: pageSize.toString(),
+      include_count: 'true'
     });
     
     if (symbol) {